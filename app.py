@@ -1,16 +1,26 @@
 import os
 import uvicorn
-from dotenv import load_dotenv
 from multi_ai.api import app
-from multi_ai.utils.helpers import create_default_env_file
+from multi_ai.utils.helpers import create_default_env_file, load_env_file
 
 # Load environment variables and create default .env file if needed
-load_dotenv()
+load_env_file()
 create_default_env_file()
 
 # Server configuration
 host = os.environ.get("HOST", "0.0.0.0")
 port = int(os.environ.get("PORT", 8000))
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
 
 if __name__ == "__main__":
-    uvicorn.run(app, host=host, port=port)
+    # uvicorn picks uvloop/httptools automatically when they're installed;
+    # multiple workers require an import string instead of the app object
+    uvicorn.run(
+        "multi_ai.api:app" if workers > 1 else app,
+        host=host,
+        port=port,
+        loop="auto",
+        http="auto",
+        workers=workers,
+        log_level=os.environ.get("LOG_LEVEL", "warning"),
+    )
@@ -1,33 +1,61 @@
-import os
+import orjson
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Body, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import (
+    HTMLResponse,
+    ORJSONResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, Any
 
+from .models.registry import close_http_client
 from .services.comparator import Comparator
+from .services.judge import close_judge_batcher
 from .utils.helpers import format_response, load_env_file
 from .config import AVAILABLE_MODELS
 
 # Load environment variables
 load_env_file()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release shared provider connections and judge workers on shutdown"""
+    yield
+    await close_judge_batcher()
+    await close_http_client()
+
+
 app = FastAPI(
     title="Multi-AI",
     description="Compare responses from multiple LLM providers",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Set up static files and templates
 app.mount("/static", StaticFiles(directory="multi_ai/static"), name="static")
-templates = Jinja2Templates(directory="multi_ai/templates")
+# Compiled templates are cached on disk (shared across workers) and never re-checked
+templates = Jinja2Templates(
+    directory="multi_ai/templates",
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=False,
+)
 
 # Initialize the comparator
 comparator = Comparator()
-# Create a second instance for blending
+# Create a second instance for blending (shares the same model clients)
 blending_comparator = Comparator(use_blending=True)
 
+# The model list is static, so serialize it once
+MODELS_PAYLOAD = orjson.dumps({"models": AVAILABLE_MODELS})
+
 
 class CompareRequest(BaseModel):
     prompt: str = Field(..., description="The prompt to send to the models")
@@ -66,7 +94,7 @@ async def home(request: Request):
 @app.get("/models")
 async def list_models():
     """List all available models by provider"""
-    return {"models": AVAILABLE_MODELS}
+    return Response(content=MODELS_PAYLOAD, media_type="application/json")
 
 
 @app.post("/compare", response_model=CompareResponse)
@@ -95,5 +123,34 @@ async def compare_models(request: CompareRequest = Body(...)):
 
         return formatted
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/compare/stream")
+async def compare_models_stream(request: CompareRequest = Body(...)):
+    """
+    Compare responses from multiple LLM providers, streaming progress events
+    as newline-delimited JSON and ending with the formatted result
+    """
+    # Select the appropriate comparator based on blend option
+    selected_comparator = blending_comparator if request.blend else comparator
+
+    async def event_stream():
+        try:
+            async for event in selected_comparator.compare_iter(
+                request.prompt, request.models
+            ):
+                if event["event"] == "result":
+                    event = {
+                        "event": "result",
+                        "data": format_response(event["data"], request.include_details),
+                    }
+                yield orjson.dumps(event) + b"\n"
+        except Exception as e:
+            # Headers are already sent, so report errors in-band
+            yield orjson.dumps({"event": "error", "detail": str(e)}) + b"\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
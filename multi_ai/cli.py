@@ -1,22 +1,49 @@
 import os
 import sys
-import argparse
 import asyncio
-import json
-from typing import Dict, Any, Optional, List
+import orjson
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Union
 
-from .services.comparator import Comparator
 from .utils.helpers import (
     load_env_file,
     format_response,
     save_to_file,
     create_default_env_file,
 )
-from .config import AVAILABLE_MODELS
+from .config import PROVIDER_DEFAULTS, MODELS_HELP_TEXT
+
+if TYPE_CHECKING:
+    import argparse
+    from .services.comparator import Comparator
+
+# Flags understood by the fast-path parser: option -> (destination, takes value)
+_COMPARE_OPTIONS = {
+    "--file": ("file", True),
+    "-f": ("file", True),
+    "--output": ("output", True),
+    "-o": ("output", True),
+    "--blend": ("blend", False),
+    "-b": ("blend", False),
+    "--details": ("details", False),
+    "-d": ("details", False),
+    "--openai": ("openai", True),
+    "--anthropic": ("anthropic", True),
+    "--gemini": ("gemini", True),
+}
+_SETUP_OPTIONS = {
+    "--force": ("force", False),
+    "-f": ("force", False),
+}
+
+
+@lru_cache(maxsize=1)
+def build_parser() -> "argparse.ArgumentParser":
+    """Build the command line parser (constructed once per process)."""
+    # Imported here since the common invocations never need it
+    import argparse
 
-
-def parse_args():
-    """Parse command line arguments."""
     parser = argparse.ArgumentParser(
         description="Multi-AI - Compare responses from multiple LLM providers"
     )
@@ -47,15 +74,15 @@ def parse_args():
     # Models for each provider
     compare_parser.add_argument(
         "--openai",
-        help=f"OpenAI model to use (default: {AVAILABLE_MODELS['openai']['default']})",
+        help=f"OpenAI model to use (default: {PROVIDER_DEFAULTS['openai']})",
     )
     compare_parser.add_argument(
         "--anthropic",
-        help=f"Anthropic model to use (default: {AVAILABLE_MODELS['anthropic']['default']})",
+        help=f"Anthropic model to use (default: {PROVIDER_DEFAULTS['anthropic']})",
     )
     compare_parser.add_argument(
         "--gemini",
-        help=f"Google Gemini model to use (default: {AVAILABLE_MODELS['gemini']['default']})",
+        help=f"Google Gemini model to use (default: {PROVIDER_DEFAULTS['gemini']})",
     )
 
     # List models command
@@ -69,7 +96,84 @@ def parse_args():
         "--force", "-f", action="store_true", help="Overwrite existing configuration"
     )
 
-    return parser.parse_args()
+    return parser
+
+
+def parse_args(
+    argv: Optional[List[str]] = None,
+) -> Union[SimpleNamespace, "argparse.Namespace"]:
+    """Parse command line arguments."""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # argparse is only imported when the fast path can't handle the arguments
+    args: Union[SimpleNamespace, "argparse.Namespace", None] = _fast_parse_args(argv)
+    if args is None:
+        args = build_parser().parse_args(argv)
+    return args
+
+
+def _fast_parse_args(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    Parse the common command lines without building the argparse parser.
+
+    Returns None for anything unusual (help, unknown or malformed options),
+    in which case argparse handles the arguments and reports errors.
+    """
+    if not argv:
+        return None
+
+    command, rest = argv[0], argv[1:]
+    if command == "models":
+        return SimpleNamespace(command=command) if not rest else None
+
+    if command == "setup":
+        args = SimpleNamespace(command=command, force=False)
+        options = _SETUP_OPTIONS
+    elif command == "compare":
+        args = SimpleNamespace(
+            command=command,
+            prompt=None,
+            file=None,
+            output=None,
+            blend=False,
+            details=False,
+            openai=None,
+            anthropic=None,
+            gemini=None,
+        )
+        options = _COMPARE_OPTIONS
+    else:
+        return None
+
+    i = 0
+    while i < len(rest):
+        arg = rest[i]
+        if arg in options:
+            dest, takes_value = options[arg]
+            if not takes_value:
+                setattr(args, dest, True)
+            elif i + 1 < len(rest) and not rest[i + 1].startswith("-"):
+                i += 1
+                setattr(args, dest, rest[i])
+            else:
+                return None
+        elif arg.startswith("-") or command != "compare" or args.prompt is not None:
+            return None
+        else:
+            args.prompt = arg
+        i += 1
+
+    return args
+
+
+@lru_cache(maxsize=None)
+def get_comparator(blend: bool = False) -> "Comparator":
+    """Get the process-wide comparator for the given mode."""
+    # Imported here so 'models' and 'setup' don't pay for provider SDK imports
+    from .services.comparator import Comparator
+
+    return Comparator(use_blending=blend)
 
 
 async def compare(
@@ -79,7 +183,7 @@ async def compare(
     include_details: bool = True,
 ) -> Dict[str, Any]:
     """Compare LLM responses."""
-    comparator = Comparator(use_blending=blend)
+    comparator = get_comparator(blend)
     result = await comparator.compare(prompt, models)
     return format_response(result, include_details)
 
@@ -99,27 +203,34 @@ def setup_config(force: bool = False) -> None:
 def list_models() -> None:
     """List available models."""
     print("Available models:")
+    print(MODELS_HELP_TEXT)
 
-    for provider, info in AVAILABLE_MODELS.items():
-        print(f"\n{provider.upper()} (default: {info['default']})")
-        print("-" * (len(provider) + 15))
 
-        for model in info["models"]:
-            print(f"  {model['id']} - {model['name']}")
+def read_text_file(filepath: str) -> str:
+    """Read a UTF-8 file with a single sized read instead of buffered text IO."""
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        # Files can grow or report a size of 0 (e.g. /proc); read the rest
+        while chunk := os.read(fd, 65536):
+            data += chunk
+    finally:
+        os.close(fd)
+    return data.decode("utf-8")
 
 
 def get_prompt(args) -> str:
     """Get prompt from command line or file."""
     if args.file:
-        with open(args.file, "r") as f:
-            return f.read()
+        return read_text_file(args.file)
 
     if args.prompt:
         return args.prompt
 
     # If no prompt is provided, read from stdin
     if not sys.stdin.isatty():
-        return sys.stdin.read()
+        return sys.stdin.buffer.read().decode("utf-8")
 
     print("Error: No prompt provided. Use positional argument, --file, or pipe input.")
     sys.exit(1)
@@ -163,7 +274,7 @@ def main():
             print(f"Results saved to {args.output}")
         else:
             # Just print the result
-            print(json.dumps(result, indent=2))
+            print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
     else:
         print("No command specified. Use 'compare', 'models', or 'setup'.")
         sys.exit(1)
@@ -2,7 +2,7 @@
 Configuration settings for the multi-AI application.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 # Default models for each provider
 OPENAI_DEFAULT_MODEL: str = "gpt-4.1-2025-04-14"
@@ -12,6 +12,31 @@ GEMINI_DEFAULT_MODEL: str = "gemini-2.5-pro-preview-05-06"
 # Model used for judging responses
 JUDGE_DEFAULT_PROVIDER: str = "openai"
 JUDGE_DEFAULT_MODEL: str = "o3-2025-04-16"
+JUDGE_DEFAULT_SAMPLES: int = 1  # concurrent judge calls aggregated per verdict
+JUDGE_STREAM: bool = False  # stream blended text as it is generated
+JUDGE_BATCH_SIZE: int = 8  # prompts packed into one judge call by evaluate_batch
+# Process-wide ceiling on concurrent judge calls and on their estimated
+# tokens per minute (prompt length / 4 plus an output budget; 0 disables)
+JUDGE_MAX_INFLIGHT: int = 32
+JUDGE_MAX_TPM: int = 2_000_000
+# Estimated-token boundaries for grouping concurrent judge calls into bins of
+# similar length; binning is off unless JUDGE_BIN_BOUNDARIES is set
+# (e.g. "1000,4000")
+JUDGE_BIN_BOUNDARIES: Tuple[int, ...] = (1000, 4000)
+# Concurrent judge calls allowed per bin, so long calls can't use up the
+# slots that short ones need
+JUDGE_BIN_MAX_INFLIGHT: int = 8
+# Return a short judge_response_id instead of the raw judge output
+JUDGE_COMPACT_OUTPUT: bool = False
+# Skip the blending call when one response carries at least this share of
+# the weight (1.0 or more disables)
+BLEND_DOMINANCE_THRESHOLD: float = 0.8
+JUDGE_CACHE_SIZE: int = 1024  # cached verdicts
+JUDGE_CACHE_TTL: int = 600  # seconds
+# Semantic verdict cache for paraphrased prompts; off unless
+# JUDGE_SEMANTIC_THRESHOLD is set (e.g. 0.95 cosine similarity)
+JUDGE_SEMANTIC_CACHE_SIZE: int = 256
+JUDGE_EMBEDDING_MODEL: str = "text-embedding-3-small"
 
 # Default server settings
 DEFAULT_HOST: str = "0.0.0.0"
@@ -59,5 +84,36 @@ AVAILABLE_MODELS: Dict[str, Dict[str, Any]] = {
     },
 }
 
+# Derived lookups, computed once at import for the CLI
+PROVIDER_DEFAULTS: Dict[str, str] = {
+    provider: info["default"] for provider, info in AVAILABLE_MODELS.items()
+}
+MODELS_HELP_TEXT: str = "\n".join(
+    f"\n{provider.upper()} (default: {info['default']})\n"
+    + "-" * (len(provider) + 15)
+    + "".join(f"\n  {model['id']} - {model['name']}" for model in info["models"])
+    for provider, info in AVAILABLE_MODELS.items()
+)
+
 # Application settings
 DEFAULT_TIMEOUT: int = 60  # seconds
+
+# Response cache settings
+RESPONSE_CACHE_SIZE: int = 1024  # entries
+RESPONSE_CACHE_TTL: int = 600  # seconds
+
+# Per-provider request limits (override with e.g. OPENAI_MAX_INFLIGHT / OPENAI_MAX_QPM)
+PROVIDER_MAX_INFLIGHT: int = 8  # concurrent requests
+PROVIDER_MAX_QPM: int = 500  # requests per minute, 0 disables
+
+# Once this many providers have succeeded, wait at most STRAGGLER_MS for the
+# rest before judging. Off by default (0 waits for all), since dropping a slow
+# provider changes the result; deployments opt in with the STRAGGLER_MS env var
+STRAGGLER_MIN_RESPONSES: int = 2
+STRAGGLER_MS: int = 0
+
+# Start the judge once STRAGGLER_MIN_RESPONSES providers have succeeded and
+# restart it if a later response arrives first. A judge that finishes before
+# the last provider drops that provider's response, so this is off unless
+# enabled with SPECULATIVE_JUDGE=1
+SPECULATIVE_JUDGE: bool = False
@@ -1,5 +1,30 @@
-from .openai_model import OpenAIModel
-from .anthropic_model import AnthropicModel
-from .gemini_model import GeminiModel
+import importlib
+from typing import Any
 
-__all__ = ["OpenAIModel", "AnthropicModel", "GeminiModel"]
+# Provider SDKs are heavy to import, so model classes are loaded on first access
+_LAZY_ATTRS = {
+    "OpenAIModel": ".openai_model",
+    "AnthropicModel": ".anthropic_model",
+    "GeminiModel": ".gemini_model",
+    "get_model": ".registry",
+    "get_models": ".registry",
+    "get_http_client": ".registry",
+    "close_http_client": ".registry",
+}
+
+__all__ = [
+    "OpenAIModel",
+    "AnthropicModel",
+    "GeminiModel",
+    "get_model",
+    "get_models",
+    "get_http_client",
+    "close_http_client",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
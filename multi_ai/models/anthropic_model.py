@@ -10,12 +10,13 @@ class AnthropicModel(BaseModel):
         self.provider_name = "Anthropic"
 
     def initialize_client(self) -> None:
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # Async client so concurrent provider queries don't block the event loop
+        self.client = anthropic.AsyncAnthropic(api_key=self.api_key)
 
     async def _execute_query(
         self, prompt: str, model: str = ANTHROPIC_DEFAULT_MODEL
     ) -> str:
-        response = self.client.messages.create(
+        response = await self._require_client().messages.create(
             model=model,
             max_tokens=4000,
             messages=[{"role": "user", "content": prompt}],
@@ -1,38 +1,69 @@
 import os
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
 from ..config import DEFAULT_TIMEOUT
 
 
+def error_response(provider: str, model: str, error: str) -> Dict[str, Any]:
+    """Build the structured response returned for a failed query."""
+    return {"provider": provider, "model": model, "error": error, "success": False}
+
+
 class BaseModel:
     def __init__(
         self, api_key: Optional[str] = None, env_var_name: Optional[str] = None
     ) -> None:
         self.api_key = api_key or os.environ.get(env_var_name)
+        self.env_var_name = env_var_name
         self.provider_name = "Base"
         self.timeout = DEFAULT_TIMEOUT
-        self.initialize_client()
+        # Provider SDK client, built by initialize_client once a key is known
+        self.client: Optional[Any] = None
+
+        # Without a key the client could only fail, so don't build it
+        if self.api_key:
+            self.initialize_client()
 
     def initialize_client(self) -> None:
         """Initialize the API client - to be implemented by subclasses"""
         pass
 
+    def _require_client(self) -> Any:
+        """Return the API client, raising if it was never initialized."""
+        if self.client is None:
+            raise RuntimeError(
+                f"{self.provider_name} client is not initialized "
+                f"(set {self.env_var_name})"
+            )
+        return self.client
+
     async def query(self, prompt: str, model: str) -> Dict[str, Any]:
         """Query the model with the given prompt"""
+        if not self.api_key:
+            return error_response(
+                self.provider_name,
+                model,
+                f"Missing API key (set {self.env_var_name})",
+            )
+
         try:
             response_text = await self._execute_query(prompt, model)
-            return {
-                "provider": self.provider_name,
-                "model": model,
-                "response": response_text,
-                "success": True,
-            }
         except Exception as e:
-            return {
-                "provider": self.provider_name,
-                "model": model,
-                "error": str(e),
-                "success": False,
-            }
+            return error_response(self.provider_name, model, str(e))
+
+        return {
+            "provider": self.provider_name,
+            "model": model,
+            "response": response_text,
+            "success": True,
+        }
+
+    async def query_stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        """Yield the response text in chunks - by default all at once"""
+        yield await self._execute_query(prompt, model)
+
+    async def embed(self, text: str, model: str) -> List[float]:
+        """Return the embedding vector for text - for providers that support it"""
+        raise NotImplementedError(f"{self.provider_name} does not support embeddings")
 
     async def _execute_query(self, prompt: str, model: str) -> str:
         """Execute the actual API call - to be implemented by subclasses"""
@@ -1,15 +1,19 @@
 from google import genai
 from typing import Optional
 import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from .base_model import BaseModel
 from ..config import GEMINI_DEFAULT_MODEL
 
+logger = logging.getLogger(__name__)
+
 
 class GeminiModel(BaseModel):
     def __init__(self, api_key: Optional[str] = None) -> None:
         super().__init__(api_key, "GEMINI_API_KEY")
         self.provider_name = "Google Gemini"
-        self.initialize_client()
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def initialize_client(self) -> None:
         self.client = genai.client.Client(api_key=self.api_key)
@@ -18,15 +22,29 @@ class GeminiModel(BaseModel):
         self, prompt: str, model: str = GEMINI_DEFAULT_MODEL
     ) -> str:
         try:
-            # Run in thread pool to prevent blocking
-            loop = asyncio.get_event_loop()
+            # Prefer the SDK's native async surface when available
+            aio = getattr(self._require_client(), "aio", None)
+            if aio is not None:
+                response = await aio.models.generate_content(
+                    contents=prompt, model=model
+                )
+                return response.text
+
+            # Older SDKs are sync-only; run in a dedicated thread pool to prevent blocking
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=8, thread_name_prefix="gemini"
+                )
+            loop = asyncio.get_running_loop()
             return await loop.run_in_executor(
-                None, self._run_gemini_query, prompt, model
+                self._executor, self._run_gemini_query, prompt, model
             )
         except Exception as e:
-            print(f"Gemini API error: {str(e)}")
+            logger.warning("Gemini API error: %s", e)
             raise
 
     def _run_gemini_query(self, prompt: str, model: str) -> str:
-        response = self.client.models.generate_content(contents=prompt, model=model)
+        response = self._require_client().models.generate_content(
+            contents=prompt, model=model
+        )
         return response.text
@@ -1,24 +1,60 @@
+import httpx
 import openai
-from typing import Optional
+from typing import Any, AsyncIterator, List, Optional
 from .base_model import BaseModel
-from ..config import OPENAI_DEFAULT_MODEL
+from .registry import get_http_client
+from ..config import OPENAI_DEFAULT_MODEL, JUDGE_EMBEDDING_MODEL
 
 
 class OpenAIModel(BaseModel):
     def __init__(self, api_key: Optional[str] = None) -> None:
+        # The shared connection pool the SDK client was built on
+        self._http_client: Optional[httpx.AsyncClient] = None
         super().__init__(api_key, "OPENAI_API_KEY")
         self.provider_name = "OpenAI"
 
     def initialize_client(self) -> None:
-        self.client = openai.OpenAI(api_key=self.api_key)
+        # Async client so concurrent provider queries don't block the event loop
+        self._http_client = get_http_client()
+        self.client = openai.AsyncOpenAI(
+            api_key=self.api_key, http_client=self._http_client
+        )
+
+    def _require_client(self) -> Any:
+        # The shared pool is closed on app shutdown; rebuild on a fresh one
+        if self._http_client is not None and self._http_client.is_closed:
+            self.initialize_client()
+        return super()._require_client()
 
     async def _execute_query(
         self, prompt: str, model: str = OPENAI_DEFAULT_MODEL
     ) -> str:
-        response = self.client.chat.completions.create(
+        response = await self._require_client().chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
             timeout=self.timeout,
         )
         return response.choices[0].message.content
+
+    async def query_stream(
+        self, prompt: str, model: str = OPENAI_DEFAULT_MODEL
+    ) -> AsyncIterator[str]:
+        """Yield the response text in chunks as the model generates it."""
+        stream = await self._require_client().chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7,
+            timeout=self.timeout,
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def embed(self, text: str, model: str = JUDGE_EMBEDDING_MODEL) -> List[float]:
+        """Return the embedding vector for text."""
+        response = await self._require_client().embeddings.create(
+            model=model, input=text, timeout=self.timeout
+        )
+        return response.data[0].embedding
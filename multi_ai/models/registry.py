@@ -0,0 +1,87 @@
+import os
+import asyncio
+import importlib
+import httpx
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from .base_model import BaseModel
+from ..config import DEFAULT_TIMEOUT, PROVIDER_MAX_INFLIGHT, PROVIDER_MAX_QPM
+from ..utils.rate_limit import TokenBucket
+
+# Provider name -> (module, class); modules are imported only when first used
+MODEL_CLASSES: Dict[str, Tuple[str, str]] = {
+    "openai": (".openai_model", "OpenAIModel"),
+    "anthropic": (".anthropic_model", "AnthropicModel"),
+    "gemini": (".gemini_model", "GeminiModel"),
+}
+
+
+@lru_cache(maxsize=None)
+def get_model(provider: str) -> BaseModel:
+    """
+    Return the shared model instance for a provider.
+
+    Each model is created once per process, on first use, so every comparator
+    and judge reuses the same SDK client and its connection pool.
+    """
+    if provider not in MODEL_CLASSES:
+        raise ValueError(f"Unsupported model provider: {provider}")
+
+    module_name, class_name = MODEL_CLASSES[provider]
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)()
+
+
+@lru_cache(maxsize=None)
+def provider_limits(provider: str) -> Tuple[asyncio.Semaphore, TokenBucket]:
+    """
+    Return the process-wide in-flight limit and request rate for a provider.
+
+    Shared like the models themselves, so every comparator draws on the same
+    {PROVIDER}_MAX_INFLIGHT / {PROVIDER}_MAX_QPM budget.
+    """
+    if provider not in MODEL_CLASSES:
+        raise ValueError(f"Unsupported model provider: {provider}")
+
+    prefix = provider.upper()
+    semaphore = asyncio.Semaphore(
+        int(os.environ.get(f"{prefix}_MAX_INFLIGHT", PROVIDER_MAX_INFLIGHT))
+    )
+    rate_limiter = TokenBucket(
+        float(os.environ.get(f"{prefix}_MAX_QPM", PROVIDER_MAX_QPM))
+    )
+    return semaphore, rate_limiter
+
+
+def get_models() -> Dict[str, BaseModel]:
+    """Return the shared model instances for all providers."""
+    return {provider: get_model(provider) for provider in MODEL_CLASSES}
+
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared HTTP/2 client for httpx-based SDK clients.
+
+    The OpenAI provider model and the judge share this connection pool, so
+    they reuse TLS sessions and multiplex requests instead of each opening
+    its own pool.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=DEFAULT_TIMEOUT,
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client if it was created."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
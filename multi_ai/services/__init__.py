@@ -1,4 +1,20 @@
-from .judge import Judge
-from .comparator import Comparator
+import importlib
+from typing import Any
+
+# The comparator and judge pull in the model registry, so load them on first access
+_LAZY_ATTRS = {
+    "Judge": ".judge",
+    "Comparator": ".comparator",
+}
 
 __all__ = ["Judge", "Comparator"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+        # Cache on the package so later lookups skip __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,32 +1,58 @@
+import os
 import asyncio
-from typing import List, Dict, Any, Optional
-from ..models.openai_model import OpenAIModel
-from ..models.anthropic_model import AnthropicModel
-from ..models.gemini_model import GeminiModel
+import logging
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from ..models.base_model import BaseModel, error_response
+from ..models.registry import MODEL_CLASSES, get_model, provider_limits
 from ..config import (
     OPENAI_DEFAULT_MODEL,
     ANTHROPIC_DEFAULT_MODEL,
     GEMINI_DEFAULT_MODEL,
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_TTL,
+    STRAGGLER_MS,
+    STRAGGLER_MIN_RESPONSES,
+    SPECULATIVE_JUDGE,
 )
+from ..utils.cache import TTLCache, make_cache_key
 from .judge import Judge
 
+logger = logging.getLogger(__name__)
+
+# Judge methods whose results are a complete verdict, safe to serve from cache
+_CACHEABLE_METHODS = frozenset(
+    {"select", "blend", "blend_shortcircuit", "consensus", "single"}
+)
+
 
 class Comparator:
     """Main service to query multiple AI providers and compare their responses."""
 
     def __init__(self, use_blending: bool = False) -> None:
         """
-        Initialize the comparator with model instances.
+        Initialize the comparator.
+
+        Provider models are resolved lazily from the shared registry the first
+        time a request needs them, so unused provider SDKs are never imported.
 
         Args:
             use_blending: Whether to blend responses using weights instead of selecting one
         """
-        self.models = {
-            "openai": OpenAIModel(),
-            "anthropic": AnthropicModel(),
-            "gemini": GeminiModel(),
-        }
+        self.models: Dict[str, BaseModel] = {}
         self.judge = Judge(blend_responses=use_blending)
+        self.cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+        # Comparisons currently running, so identical concurrent requests share one
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        # How long to wait for slow providers once enough have responded
+        self.straggler_timeout = (
+            float(os.environ.get("STRAGGLER_MS", STRAGGLER_MS)) / 1000
+        )
+
+        # Start judging before slow providers finish, restarting if they arrive
+        self.speculative_judge = (
+            os.environ.get("SPECULATIVE_JUDGE", str(int(SPECULATIVE_JUDGE))) != "0"
+        )
 
     async def compare(
         self,
@@ -44,70 +70,251 @@ class Comparator:
         Returns:
             Dictionary containing the best/blended response and evaluation details
         """
-        # Use default models if not specified
-        if model_configs is None:
-            model_configs = {
-                "openai": OPENAI_DEFAULT_MODEL,
-                "anthropic": ANTHROPIC_DEFAULT_MODEL,
-                "gemini": GEMINI_DEFAULT_MODEL,
-            }
+        model_configs = self._resolve_model_configs(model_configs)
+        key = make_cache_key(prompt, model_configs, self.judge.blend_responses)
+
+        # Join an identical comparison that is already running. The work runs
+        # in its own task, so a caller being cancelled doesn't cancel it for
+        # the others.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compare_once(prompt, model_configs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        return await asyncio.shield(task)
+
+    async def _compare_once(
+        self, prompt: str, model_configs: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """Run one comparison to completion and return its result."""
+        result: Dict[str, Any] = {}
+        async for event in self.compare_iter(prompt, model_configs):
+            if event["event"] == "result":
+                result = event["data"]
+        return result
+
+    def _finish_inflight(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished comparison so later requests start afresh."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark a failure as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def compare_iter(
+        self,
+        prompt: str,
+        model_configs: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Query multiple AI providers and yield progress events as they happen.
+
+        Events are dictionaries with an "event" key:
+            provider_done: a provider finished (includes provider, model, success)
+            provider_timeout: a slow provider was dropped (includes provider)
+            judging: the judge started evaluating (repeats if a speculative
+                evaluation is restarted with a late response)
+            blend_chunk: a piece of blended text, under "text" (only when the
+                judge is blending with streaming enabled)
+            result: the final comparison result, under "data"
+
+        Args:
+            prompt: The user's prompt to send to all models
+            model_configs: Optional mapping of provider -> model name
+                          (defaults to config settings if not provided)
+        """
+        model_configs = self._resolve_model_configs(model_configs)
+
+        # Serve repeated requests from the cache
+        cache_key = make_cache_key(prompt, model_configs, self.judge.blend_responses)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            yield {"event": "result", "data": cached}
+            return
 
         # Create tasks for querying each model
-        tasks = []
-        providers = []
+        tasks: List[asyncio.Task] = []
+        providers: List[str] = []
 
         for provider, model in model_configs.items():
-            if provider in self.models:
-                task = self._query_with_fallback(provider, model, prompt)
+            if provider in MODEL_CLASSES:
+                task = asyncio.create_task(
+                    self._query_indexed(len(tasks), provider, model, prompt)
+                )
                 tasks.append(task)
                 providers.append(provider)
 
-        # Execute all queries concurrently
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
+        # Report each provider as soon as it finishes. Once enough providers
+        # have succeeded the judge starts speculatively, and stragglers get a
+        # fixed budget before being dropped.
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+        loop = asyncio.get_running_loop()
+        pending = set(tasks)
+        deadline: Optional[float] = None
+        judge_task: Optional["asyncio.Task[Dict[str, Any]]"] = None
+        judge_chunks: Optional[asyncio.Queue] = None
+        judged_count = 0
+        try:
+            while pending:
+                waiting = pending | {judge_task} if judge_task else pending
+                timeout = None if deadline is None else max(0, deadline - loop.time())
+                done, _ = await asyncio.wait(
+                    waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                pending -= done
+
+                for task in done:
+                    if task is judge_task:
+                        continue
+                    index, response = task.result()
+                    responses[index] = response
+                    yield {
+                        "event": "provider_done",
+                        "provider": providers[index],
+                        "model": response.get("model"),
+                        "success": response.get("success", False),
+                    }
+
+                # The judge beat the remaining providers
+                if judge_task is not None and judge_task in done:
+                    break
+
+                successful_responses = self._successful(responses)
+
+                # A new response arrived that the speculative judge hasn't seen
+                if judge_task is not None and len(successful_responses) > judged_count:
+                    judge_task.cancel()
+                    judge_task = None
+
+                if len(successful_responses) >= STRAGGLER_MIN_RESPONSES:
+                    if deadline is None and self.straggler_timeout > 0:
+                        deadline = loop.time() + self.straggler_timeout
+
+                    if judge_task is None and pending and self.speculative_judge:
+                        yield {"event": "judging"}
+                        judge_task, judge_chunks = self._start_judge(
+                            prompt, successful_responses
+                        )
+                        judged_count = len(successful_responses)
+
+            for index, slot in enumerate(responses):
+                if slot is None:
+                    yield {"event": "provider_timeout", "provider": providers[index]}
+
+            # Only keep successful responses, in the requested provider order
+            successful_responses = self._successful(responses)
+
+            logger.debug("Received %d successful responses", len(successful_responses))
 
-        # Process responses
-        processed_responses = []
-        for i, response in enumerate(responses):
-            provider = providers[i]
+            # If no successful responses, return error
+            if not successful_responses:
+                yield {
+                    "event": "result",
+                    "data": {
+                        "result": "All models failed to respond. Please try again.",
+                        "success": False,
+                    },
+                }
+                return
 
-            # If response is an exception, log it
-            if isinstance(response, Exception):
-                print(f"Error from {provider}: {str(response)}")
-            else:
-                # Add the response to processed responses
-                processed_responses.append(response)
+            # Let the judge evaluate the responses, unless it already has them all
+            if judge_task is None or judged_count != len(successful_responses):
+                if judge_task is not None:
+                    judge_task.cancel()
+                yield {"event": "judging"}
+                judge_task, judge_chunks = self._start_judge(
+                    prompt, successful_responses
+                )
 
-        # Only keep successful responses
-        successful_responses = [
-            r for r in processed_responses if r.get("success", False)
-        ]
+            # Forward blended text as it streams; chunks from a discarded
+            # speculative judge were queued separately and are never sent
+            if judge_chunks is not None:
+                while True:
+                    next_chunk = asyncio.ensure_future(judge_chunks.get())
+                    done, _ = await asyncio.wait(
+                        {next_chunk, judge_task}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if next_chunk not in done:
+                        next_chunk.cancel()
+                        break
+                    yield {"event": "blend_chunk", "text": next_chunk.result()}
+                while not judge_chunks.empty():
+                    yield {"event": "blend_chunk", "text": judge_chunks.get_nowait()}
+            result = await judge_task
+        finally:
+            # Don't leave provider or judge calls running if they timed out,
+            # lost to the judge, or the consumer went away
+            for task in tasks:
+                task.cancel()
+            if judge_task is not None:
+                judge_task.cancel()
 
-        # Print debug info
-        print(f"Received {len(successful_responses)} successful responses")
+        # Only cache complete results the judge fully produced; a fallback or
+        # a verdict missing failed or dropped providers should be retried
+        if (
+            result.get("success", False)
+            and result.get("method") in _CACHEABLE_METHODS
+            and len(successful_responses) == len(tasks)
+        ):
+            self.cache.set(cache_key, result)
 
-        # If no successful responses, return error
-        if not successful_responses:
+        yield {"event": "result", "data": result}
+
+    def _start_judge(
+        self, prompt: str, responses: List[Dict[str, Any]]
+    ) -> Tuple["asyncio.Task[Dict[str, Any]]", Optional[asyncio.Queue]]:
+        """Start the judge, with a queue of blended text chunks if streaming."""
+        if not (self.judge.stream and self.judge.blend_responses):
+            return asyncio.create_task(self.judge.evaluate(prompt, responses)), None
+
+        chunks: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(
+            self.judge.evaluate(prompt, responses, on_token=chunks.put_nowait)
+        )
+        return task, chunks
+
+    @staticmethod
+    def _successful(responses: List[Optional[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Filter to the successful responses, keeping their order."""
+        return [r for r in responses if r is not None and r.get("success", False)]
+
+    def _resolve_model_configs(
+        self, model_configs: Optional[Dict[str, str]]
+    ) -> Dict[str, str]:
+        """Use default models if not specified."""
+        if model_configs is None:
             return {
-                "result": "All models failed to respond. Please try again.",
-                "success": False,
+                "openai": OPENAI_DEFAULT_MODEL,
+                "anthropic": ANTHROPIC_DEFAULT_MODEL,
+                "gemini": GEMINI_DEFAULT_MODEL,
             }
+        return model_configs
 
-        # Let the judge evaluate the responses
-        result = await self.judge.evaluate(prompt, successful_responses)
-
-        return result
+    async def _query_indexed(
+        self, index: int, provider: str, model: str, prompt: str
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Query a model and tag the response with its position in the request."""
+        return index, await self._query_with_fallback(provider, model, prompt)
 
     async def _query_with_fallback(
         self, provider: str, model: str, prompt: str
     ) -> Dict[str, Any]:
         """Query a model with error handling and fallback."""
         try:
-            return await self.models[provider].query(prompt, model)
+            # Limits are per provider and shared by every comparator, to avoid 429s
+            semaphore, rate_limiter = provider_limits(provider)
+            async with semaphore:
+                await rate_limiter.acquire()
+                return await self._get_model(provider).query(prompt, model)
         except Exception as e:
             # Return a structured error response instead of propagating the exception
-            return {
-                "provider": provider,
-                "model": model,
-                "error": f"Query failed: {str(e)}",
-                "success": False,
-            }
+            return error_response(provider, model, "Query failed: " + str(e))
+
+    def _get_model(self, provider: str) -> BaseModel:
+        """Get the model for a provider, loading the shared instance on first use."""
+        model = self.models.get(provider)
+        if model is None:
+            model = self.models[provider] = get_model(provider)
+        return model
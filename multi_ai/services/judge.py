@@ -1,10 +1,274 @@
 import os
 import re
+import io
 import json
+import math
+import asyncio
+import time
 import random
-from typing import List, Dict, Any, Optional, Tuple
-from ..models.openai_model import OpenAIModel
-from ..config import JUDGE_DEFAULT_PROVIDER, JUDGE_DEFAULT_MODEL
+import hashlib
+import bisect
+from functools import lru_cache
+from collections import Counter, deque
+from typing import (
+    Awaitable,
+    Callable,
+    Deque,
+    List,
+    Dict,
+    Any,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+from ..models.registry import get_model
+from ..config import (
+    JUDGE_DEFAULT_PROVIDER,
+    JUDGE_DEFAULT_MODEL,
+    JUDGE_DEFAULT_SAMPLES,
+    JUDGE_STREAM,
+    JUDGE_BATCH_SIZE,
+    JUDGE_COMPACT_OUTPUT,
+    JUDGE_MAX_INFLIGHT,
+    JUDGE_MAX_TPM,
+    JUDGE_BIN_BOUNDARIES,
+    JUDGE_BIN_MAX_INFLIGHT,
+    BLEND_DOMINANCE_THRESHOLD,
+    JUDGE_CACHE_SIZE,
+    JUDGE_CACHE_TTL,
+    JUDGE_SEMANTIC_CACHE_SIZE,
+    JUDGE_EMBEDDING_MODEL,
+)
+from ..utils.cache import TTLCache
+from ..utils.rate_limit import TokenBucket
+
+# Patterns used to parse judge output
+_INT_RE = re.compile(r"\b(\d+)\b")
+_NUM_RE = re.compile(r"[\d.]+")
+_QUOTE_TBL = str.maketrans("", "", "'\"")
+_DECODER = json.JSONDecoder()
+
+T = TypeVar("T")
+
+# Output tokens budgeted per judge call when estimating its cost
+_OUTPUT_TOKEN_ESTIMATE = 500
+
+
+@lru_cache(maxsize=1)
+def _judge_limits() -> Tuple[asyncio.Semaphore, TokenBucket]:
+    """
+    Return the process-wide judge concurrency limit and token budget.
+
+    Created on first use so JUDGE_MAX_INFLIGHT / JUDGE_MAX_TPM set from a
+    .env file are honoured, and shared by every Judge since they share a model.
+    """
+    semaphore = asyncio.Semaphore(
+        int(os.environ.get("JUDGE_MAX_INFLIGHT", JUDGE_MAX_INFLIGHT))
+    )
+    token_budget = TokenBucket(float(os.environ.get("JUDGE_MAX_TPM", JUDGE_MAX_TPM)))
+    return semaphore, token_budget
+
+
+@lru_cache(maxsize=1)
+def _judge_batcher() -> Optional["JudgeBatcher"]:
+    """Return the process-wide JudgeBatcher if JUDGE_BIN_BOUNDARIES is set."""
+    boundaries = os.environ.get("JUDGE_BIN_BOUNDARIES")
+    if not boundaries:
+        return None
+    return JudgeBatcher(
+        tuple(int(b) for b in boundaries.split(",") if b.strip()),
+        int(os.environ.get("JUDGE_BIN_MAX_INFLIGHT", JUDGE_BIN_MAX_INFLIGHT)),
+    )
+
+
+# Static sections of the judge prompts
+_EVAL_HEADER = (
+    "You are a fair and impartial judge evaluating responses from different AI models.\n"
+    "You must evaluate each response solely on its quality and merit, not based on which model produced it.\n"
+)
+_EVAL_CRITERIA = (
+    "\nEvaluate each response based on these criteria:\n"
+    "1. Accuracy: Is the information correct and reliable?\n"
+    "2. Completeness: Does it fully address all aspects of the prompt?\n"
+    "3. Clarity: Is it well-written, easy to understand, and well-structured?\n"
+    "4. Usefulness: How practical and helpful is the response?\n"
+    "5. Creativity: Where appropriate, does it show original thinking?\n"
+    "6. Reasoning: Does it demonstrate logical thinking and good judgment?\n"
+    "\nIMPORTANT: All responses come from equally capable models. Judge each response strictly on its quality as presented here.\n"
+)
+_EVAL_FOOTER_BLEND = (
+    "\nYOUR RESPONSE FORMAT:\n"
+    "1. Provide a brief explanation (1-2 sentences) of how you evaluated these responses.\n"
+    "2. Assign a weight between 0 and 10 to each response based on overall quality.\n"
+    'Format your response like this:\n{"explanation": "Your explanation here", "weights": [X, Y, Z]}\n'
+    "Where X, Y, Z are numbers between 0 and 10 representing the quality of each response."
+)
+_EVAL_FOOTER_SELECT = (
+    "\nYOUR RESPONSE FORMAT:\n"
+    "1. Provide a brief explanation (1-2 sentences) of why you selected the best response.\n"
+    "2. Identify the number of the best response.\n"
+    'Format your response like this:\n{"explanation": "Your explanation here", "selection": N}\n'
+    "Where N is the number of the best response (e.g., 1, 2, or 3)."
+)
+_EVAL_FOOTER_BATCH = (
+    "\nYOUR RESPONSE FORMAT:\n"
+    "Judge each problem independently. For every problem, in order, provide a brief "
+    "explanation (1-2 sentences) and the number of the best response within that problem.\n"
+    'Format your response like this:\n{"verdicts": [{"explanation": "Your explanation here", "selection": N}, ...]}\n'
+    "With exactly one verdict per problem."
+)
+_BLEND_HEADER = "You are an expert at synthesizing information from multiple sources.\n"
+_BLEND_INSTRUCTIONS = (
+    "You will be given multiple responses to this prompt with assigned weights.\n"
+    "Your task is to create a SINGLE COHERENT RESPONSE that:\n"
+    "1. Incorporates content from all responses according to their weights\n"
+    "2. Prioritizes information from higher-weighted responses\n"
+    "3. Resolves any contradictions by favoring higher-weighted responses\n"
+    "4. Maintains a consistent tone and style throughout\n"
+    "5. Forms a complete, well-structured answer to the original prompt\n\n"
+    "Responses with their weights:\n"
+)
+_BLEND_FOOTER = (
+    "\nNow, create a single coherent response that blends these sources according to their weights."
+    "\nDo not mention the weights or that this is a blend in your response."
+    "\nWrite in a natural, flowing style as if this was a single response from the beginning."
+)
+
+
+def _normalize_weights(weights: List[float]) -> Optional[List[float]]:
+    """Scale weights to sum to 1, or return None if they are empty or sum to 0."""
+    total = math.fsum(weights) if weights else 0.0
+    if not total:
+        return None
+    return [w / total for w in weights]
+
+
+def _write_responses(
+    write: Callable[[str], Any], responses: List[Dict[str, Any]]
+) -> None:
+    """Write anonymized responses as numbered sections of a judge prompt."""
+    for i, response in enumerate(responses, 1):
+        write(
+            "\n--- Response %d: %s (%s) ---\n%s\n\n"
+            % (i, response["provider"], response["model"], response["response"])
+        )
+
+
+def _extract_json(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the first JSON object embedded in text, or None.
+
+    Decodes in place from each "{" in turn, so prose before the object and
+    trailing text after it don't need to be stripped first.
+    """
+    start = text.find("{")
+    while start != -1:
+        try:
+            data, _ = _DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            pass
+        else:
+            if isinstance(data, dict):
+                return data
+        start = text.find("{", start + 1)
+    return None
+
+
+async def close_judge_batcher() -> None:
+    """Stop the process-wide JudgeBatcher's workers if one was configured."""
+    batcher = _judge_batcher()
+    if batcher is not None:
+        await batcher.close()
+
+
+class JudgeBatcher:
+    """
+    Dispatches concurrent judge calls in bins of similar estimated length.
+
+    Each bin has its own queue, worker and concurrency limit. Calls in a bin
+    start in arrival order as soon as one of its slots is free, so a burst of
+    long calls can't hold up short ones, which are paced by their own bin.
+    """
+
+    def __init__(
+        self,
+        boundaries: Sequence[int] = JUDGE_BIN_BOUNDARIES,
+        max_inflight: int = JUDGE_BIN_MAX_INFLIGHT,
+    ) -> None:
+        """
+        Initialize the batcher.
+
+        Args:
+            boundaries: Estimated-token upper bounds of every bin but the last
+            max_inflight: Concurrent calls allowed in each bin
+        """
+        self.boundaries = sorted(boundaries)
+        self.max_inflight = max_inflight
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queues: List[asyncio.Queue] = []
+        self._workers: List[asyncio.Task] = []
+
+    async def submit(self, tokens: int, call: Callable[[], Awaitable[T]]) -> T:
+        """Queue call in the bin for its estimated token count and await its result."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Workers belong to the loop they were started on
+            self._loop = loop
+            self._queues = [asyncio.Queue() for _ in range(len(self.boundaries) + 1)]
+            self._workers = [
+                loop.create_task(self._worker(queue)) for queue in self._queues
+            ]
+
+        future = loop.create_future()
+        queue = self._queues[bisect.bisect_left(self.boundaries, tokens)]
+        queue.put_nowait((call, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the bin workers."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._loop = None
+        self._queues = []
+        self._workers = []
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        """Start one bin's calls in order, at most max_inflight at a time."""
+        slots = asyncio.Semaphore(self.max_inflight)
+        running: Set[asyncio.Task] = set()
+        try:
+            while True:
+                await slots.acquire()
+                call, future = await queue.get()
+                task = asyncio.create_task(self._run(call, future))
+                running.add(task)
+                task.add_done_callback(running.discard)
+                task.add_done_callback(lambda _: slots.release())
+                # A caller that gives up stops its call too
+                future.add_done_callback(
+                    lambda done, task=task: task.cancel() if done.cancelled() else None
+                )
+        finally:
+            # Stopping the worker stops the calls it started
+            for task in running:
+                task.cancel()
+
+    @staticmethod
+    async def _run(call: Callable[[], Awaitable[Any]], future: asyncio.Future) -> None:
+        """Run one call, unless its caller already gave up, and resolve its future."""
+        if future.done():
+            return
+        try:
+            result = await call()
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
 
 
 class Judge:
@@ -15,6 +279,12 @@ class Judge:
         model_provider: Optional[str] = None,
         model_name: Optional[str] = None,
         blend_responses: bool = False,
+        semantic_threshold: Optional[float] = None,
+        num_judge_samples: Optional[int] = None,
+        seed: Optional[int] = None,
+        stream: Optional[bool] = None,
+        blend_dominance_threshold: Optional[float] = None,
+        compact_output: Optional[bool] = None,
     ) -> None:
         """
         Initialize the judge with the specified model provider and model name.
@@ -23,27 +293,106 @@ class Judge:
             model_provider: The provider to use for judging
             model_name: The model name to use for judging
             blend_responses: Whether to blend responses using weights or select a single best response
+            semantic_threshold: Cosine similarity above which a verdict for a similar
+                prompt with the same responses is reused (None disables the semantic cache)
+            num_judge_samples: Number of judge calls issued concurrently and aggregated
+                into one verdict (majority vote for selection, mean weights for blending)
+            seed: Seed for the anonymization shuffle, for reproducible ordering
+            stream: Whether callers should stream blended text as it is generated
+                (see the on_token argument of evaluate)
+            blend_dominance_threshold: Weight share at which the top response is
+                returned as-is instead of blending (1.0 or more always blends)
+            compact_output: Whether results carry a judge_response_id (see
+                get_judge_response) instead of the full judge output
         """
         self.model_provider = model_provider or os.environ.get(
             "JUDGE_MODEL_PROVIDER", JUDGE_DEFAULT_PROVIDER
         )
-        self.model_name = model_name or os.environ.get(
-            "JUDGE_MODEL", JUDGE_DEFAULT_MODEL
+        self.model_name: str = (
+            model_name or os.environ.get("JUDGE_MODEL") or JUDGE_DEFAULT_MODEL
         )
         self.blend_responses = blend_responses
+        self.num_judge_samples = num_judge_samples or int(
+            os.environ.get("JUDGE_SAMPLES", JUDGE_DEFAULT_SAMPLES)
+        )
+        self._rng = random.Random(seed)
+        if stream is None:
+            stream = os.environ.get("JUDGE_STREAM", str(int(JUDGE_STREAM))) != "0"
+        self.stream = stream
+        self.blend_dominance_threshold = (
+            blend_dominance_threshold
+            if blend_dominance_threshold is not None
+            else float(
+                os.environ.get("BLEND_DOMINANCE_THRESHOLD", BLEND_DOMINANCE_THRESHOLD)
+            )
+        )
+        if compact_output is None:
+            compact_output = (
+                os.environ.get("JUDGE_COMPACT_OUTPUT", str(int(JUDGE_COMPACT_OUTPUT)))
+                != "0"
+            )
+        self.compact_output = compact_output
+        # Raw judge outputs by id, for results returned in compact form
+        self._judge_responses = TTLCache(maxsize=JUDGE_CACHE_SIZE, ttl=JUDGE_CACHE_TTL)
+        # Verdicts keyed by prompt and response set, stored in canonical order
+        self._verdict_cache = TTLCache(maxsize=JUDGE_CACHE_SIZE, ttl=JUDGE_CACHE_TTL)
 
-        # Currently only supporting OpenAI as judge
-        if self.model_provider == "openai":
-            self.model = OpenAIModel()
-        else:
+        if semantic_threshold is None and os.environ.get("JUDGE_SEMANTIC_THRESHOLD"):
+            semantic_threshold = float(os.environ["JUDGE_SEMANTIC_THRESHOLD"])
+        self.semantic_threshold = semantic_threshold
+        # (expires_at, unit prompt embedding, response fingerprint, verdict)
+        self._semantic_cache: Deque[
+            Tuple[float, List[float], str, Dict[str, Any]]
+        ] = deque(maxlen=JUDGE_SEMANTIC_CACHE_SIZE)
+
+        # Currently only supporting OpenAI as judge. The model comes from the
+        # shared registry, so judges reuse one SDK client and connection pool.
+        if self.model_provider != "openai":
             raise ValueError(f"Unsupported judge model provider: {self.model_provider}")
+        self.model = get_model(self.model_provider)
 
     async def evaluate(
-        self, prompt: str, responses: List[Dict[str, Any]]
+        self,
+        prompt: str,
+        responses: List[Dict[str, Any]],
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
         """
         Evaluate responses from different models and select the best one or blend them.
+
+        Args:
+            prompt: The original prompt
+            responses: Responses from the compared models
+            on_token: Called with each chunk of blended text as the judge generates
+                it; the complete text is still returned in the result
         """
+        return self._compact(await self._evaluate(prompt, responses, on_token))
+
+    def get_judge_response(self, judge_response_id: str) -> Optional[str]:
+        """Return the raw judge output for an id from a compact result, if still kept."""
+        return self._judge_responses.get(judge_response_id)
+
+    def _compact(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace the raw judge output with a short id when compact output is enabled."""
+        if not self.compact_output or "judge_response" not in result:
+            return result
+
+        result = dict(result)
+        text = result.pop("judge_response")
+        judge_response_id = hashlib.blake2b(
+            text.encode("utf-8"), digest_size=8
+        ).hexdigest()
+        self._judge_responses.set(judge_response_id, text)
+        result["judge_response_id"] = judge_response_id
+        return result
+
+    async def _evaluate(
+        self,
+        prompt: str,
+        responses: List[Dict[str, Any]],
+        on_token: Optional[Callable[[str], None]],
+    ) -> Dict[str, Any]:
+        """Evaluate responses, always including the raw judge output."""
         # Filter out any failed responses
         successful_responses = [r for r in responses if r.get("success", False)]
 
@@ -66,10 +415,46 @@ class Judge:
                 "success": True,
             }
 
+        # Byte-identical answers need no normalizing or hashing
+        if len({r["response"] for r in successful_responses}) == 1:
+            groups = [list(range(len(successful_responses)))]
+        else:
+            # Only send one copy of responses that differ in case or whitespace alone
+            groups = self._group_duplicates(successful_responses)
+
+        # Every model agreed, so there is nothing to judge or blend
+        if len(groups) == 1:
+            return {
+                "result": successful_responses[0]["response"],
+                "best_response": successful_responses[0],
+                "method": "consensus",
+                "reason": f"All {len(successful_responses)} models agreed",
+                "explanation": "All models returned the same response, so it was selected without judging.",
+                "success": True,
+            }
+        candidates = [successful_responses[group[0]] for group in groups]
+
+        # Reuse an earlier verdict for the same prompt and set of responses
+        fingerprint = self._response_fingerprint(candidates)
+        verdict_key = self._verdict_key(prompt, fingerprint)
+        order = self._canonical_order(candidates)
+        cached = self._verdict_cache.get(verdict_key)
+
+        # Fall back to a verdict for a paraphrase of the prompt
+        prompt_embedding = None
+        if cached is None and self.semantic_threshold is not None:
+            prompt_embedding = await self._embed_prompt(prompt)
+            if prompt_embedding is not None:
+                cached = self._semantic_lookup(prompt_embedding, fingerprint)
+
+        if cached is not None:
+            return self._from_cached_verdict(
+                cached, successful_responses, groups, order
+            )
+        rank_of = {idx: rank for rank, idx in enumerate(order)}
+
         # Anonymize the responses to prevent model bias
-        anonymized_responses, provider_map = self._anonymize_responses(
-            successful_responses
-        )
+        anonymized_responses, provider_map = self._anonymize_responses(candidates)
 
         # Create the evaluation prompt
         eval_prompt = self._create_evaluation_prompt(
@@ -77,27 +462,31 @@ class Judge:
         )
 
         # Get the judge's decision
-        judge_response = await self.model.query(eval_prompt, model=self.model_name)
+        judge_responses, judge_error = await self._sample_judge(eval_prompt)
 
-        if not judge_response.get("success", False):
+        if not judge_responses:
             # If judge fails, return the first successful response
             return {
                 "result": successful_responses[0]["response"],
                 "best_response": successful_responses[0],
                 "method": "fallback",
-                "reason": f"Judge failed: {judge_response.get('error', 'Unknown error')}",
+                "reason": f"Judge failed: {judge_error}",
                 "explanation": "The judge model encountered an error. Defaulting to the first available response.",
                 "success": True,
             }
 
         # Process the judge's response
         if self.blend_responses:
-            # Parse weights from judge's response
-            weights, explanation = self._parse_weights(
-                judge_response["response"], len(successful_responses)
+            # Parse weights from each judge sample and average them
+            judge_response = judge_responses[0]
+            weights, explanation = self._average_weights(
+                [
+                    self._parse_weights(r["response"], len(candidates))
+                    for r in judge_responses
+                ]
             )
 
-            if not weights or sum(weights) == 0:
+            if not weights:
                 # Fallback to first response if weights parsing fails
                 return {
                     "result": successful_responses[0]["response"],
@@ -108,42 +497,87 @@ class Judge:
                     "success": True,
                 }
 
-            # Normalize weights to sum to 1
-            total = sum(weights)
-            normalized_weights = [w / total for w in weights]
+            # De-anonymize the weights, also recording them in canonical order
+            judged_responses = []
+            judged_weights = []
+            canonical_weights = [0.0] * len(order)
 
-            # De-anonymize and get original responses and weights
-            original_responses = []
-            original_weights = []
+            for anon_idx, (idx, provider, model) in enumerate(provider_map):
+                judged_responses.append(candidates[idx])
+                judged_weights.append(weights[anon_idx])
+                canonical_weights[rank_of[idx]] = weights[anon_idx]
 
-            for anon_idx, (idx, provider, model) in provider_map.items():
-                original_responses.append(successful_responses[idx])
-                original_weights.append(normalized_weights[anon_idx])
+            # Blending would just restate a dominant response, so skip that
+            # call; a threshold of 1.0 or more turns the shortcut off
+            top_idx = max(range(len(judged_weights)), key=judged_weights.__getitem__)
+            blend_failed = False
+            if (
+                self.blend_dominance_threshold < 1.0
+                and judged_weights[top_idx] >= self.blend_dominance_threshold
+            ):
+                method = "blend_shortcircuit"
+                blended_result = judged_responses[top_idx]["response"]
+            else:
+                method = "blend"
+                blended = await self._blend_text_responses(
+                    prompt,
+                    judged_responses,
+                    judged_weights,
+                    on_token,
+                )
+                if blended is None:
+                    # If blending fails, return the highest weighted response
+                    blend_failed = True
+                    method = "fallback"
+                    blended_result = judged_responses[top_idx]["response"]
+                else:
+                    blended_result = blended
+
+            # A failed blend is retried next time rather than replayed
+            if not blend_failed:
+                self._remember_verdict(
+                    verdict_key,
+                    fingerprint,
+                    prompt_embedding,
+                    {
+                        "result": blended_result,
+                        "method": method,
+                        "weights": canonical_weights,
+                        "explanation": explanation,
+                        "judge_response": judge_response["response"],
+                    },
+                )
 
-            # Generate blended response
-            blended_result = await self._blend_text_responses(
-                prompt,
-                original_responses,
-                original_weights,
+            # Report every original response, sharing weight between duplicates
+            original_responses, original_weights = self._expand_duplicates(
+                successful_responses,
+                groups,
+                [
+                    (idx, weights[anon_idx])
+                    for anon_idx, (idx, _, _) in enumerate(provider_map)
+                ],
             )
 
-            return {
+            result = {
                 "result": blended_result,
                 "weights": original_weights,
                 "responses": original_responses,
-                "method": "blend",
+                "method": method,
                 "explanation": explanation,
                 "judge_response": judge_response["response"],
                 "success": True,
             }
+            if blend_failed:
+                result["reason"] = "Blending failed"
+            return result
         else:
-            # Parse selected response index and explanation
-            best_idx, explanation = self._parse_selected_index(
-                judge_response["response"]
+            # Parse selected response index and explanation by majority vote
+            best_idx, explanation, judge_response = self._vote_selection(
+                judge_responses, len(anonymized_responses)
             )
 
             # Default to first response if parsing fails
-            if best_idx is None or best_idx >= len(anonymized_responses):
+            if best_idx is None:
                 selected = successful_responses[0]
                 method = "fallback"
                 reason = "Could not parse valid selection"
@@ -151,10 +585,22 @@ class Judge:
             else:
                 # Map the anonymized index back to the original index
                 original_idx = provider_map[best_idx][0]
-                selected = successful_responses[original_idx]
+                selected = candidates[original_idx]
                 method = "select"
                 reason = f"Selected response {best_idx+1}"
 
+                self._remember_verdict(
+                    verdict_key,
+                    fingerprint,
+                    prompt_embedding,
+                    {
+                        "selected": rank_of[original_idx],
+                        "reason": reason,
+                        "explanation": explanation,
+                        "judge_response": judge_response["response"],
+                    },
+                )
+
             return {
                 "result": selected["response"],
                 "best_response": selected,
@@ -165,21 +611,380 @@ class Judge:
                 "success": True,
             }
 
+    def _group_duplicates(self, responses: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Group response indices whose text matches after normalizing case and whitespace.
+        Groups are returned in order of their first member.
+        """
+        groups: Dict[bytes, List[int]] = {}
+        for idx, response in enumerate(responses):
+            normalized = " ".join(response["response"].lower().split())
+            key = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+            groups.setdefault(key, []).append(idx)
+        return list(groups.values())
+
+    def _expand_duplicates(
+        self,
+        responses: List[Dict[str, Any]],
+        groups: List[List[int]],
+        weighted_groups: List[Tuple[int, float]],
+    ) -> Tuple[List[Dict[str, Any]], List[float]]:
+        """
+        Expand (group_index, weight) pairs into every member response,
+        splitting each group's weight equally between its members.
+        """
+        expanded_responses = []
+        expanded_weights = []
+        for group_idx, weight in weighted_groups:
+            members = groups[group_idx]
+            for member in members:
+                expanded_responses.append(responses[member])
+                expanded_weights.append(weight / len(members))
+        return expanded_responses, expanded_weights
+
+    async def evaluate_batch(
+        self, problems: List[Tuple[str, List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate several independent prompts, sharing judge calls between them.
+
+        In selection mode, problems that need the judge are packed up to
+        JUDGE_BATCH_SIZE at a time into one judge request. Blend mode, problems
+        evaluate can answer without the judge, and any problem whose batched
+        verdict can't be used are evaluated individually.
+
+        Args:
+            problems: (prompt, responses) pairs, as passed to evaluate
+        """
+        if self.blend_responses:
+            return list(
+                await asyncio.gather(*(self.evaluate(*problem) for problem in problems))
+            )
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(problems)
+        batchable = []
+        for i, (prompt, responses) in enumerate(problems):
+            successful = [r for r in responses if r.get("success", False)]
+            groups = self._group_duplicates(successful)
+            candidates = [successful[group[0]] for group in groups]
+            if len(candidates) < 2:
+                continue
+            fingerprint = self._response_fingerprint(candidates)
+            if self._verdict_cache.get(self._verdict_key(prompt, fingerprint)):
+                continue
+            batchable.append((i, prompt, candidates))
+
+        await asyncio.gather(
+            *(
+                self._judge_batch(batchable[start : start + JUDGE_BATCH_SIZE], results)
+                for start in range(0, len(batchable), JUDGE_BATCH_SIZE)
+            )
+        )
+
+        remaining = [i for i, result in enumerate(results) if result is None]
+        evaluated = await asyncio.gather(
+            *(self.evaluate(*problems[i]) for i in remaining)
+        )
+        evaluated_by_index = dict(zip(remaining, evaluated))
+
+        # Every problem now has a result, either batched or evaluated alone
+        return [
+            result if result is not None else evaluated_by_index[i]
+            for i, result in enumerate(results)
+        ]
+
+    async def _judge_batch(
+        self,
+        batch: List[Tuple[int, str, List[Dict[str, Any]]]],
+        results: List[Optional[Dict[str, Any]]],
+    ) -> None:
+        """
+        Judge a batch of (index, prompt, candidates) problems with one judge call,
+        filling results for every problem that received a usable verdict.
+        """
+        if len(batch) < 2:
+            return
+
+        buf = io.StringIO()
+        write = buf.write
+        write(_EVAL_HEADER)
+        provider_maps = []
+        for number, (_, prompt, candidates) in enumerate(batch, 1):
+            anonymized, provider_map = self._anonymize_responses(candidates)
+            provider_maps.append(provider_map)
+            write(
+                "\n=== Problem %d ===\nOriginal prompt: %s\n\nModel responses:\n"
+                % (number, prompt)
+            )
+            _write_responses(write, anonymized)
+        write(_EVAL_CRITERIA)
+        write(_EVAL_FOOTER_BATCH)
+
+        judge_response = await self._query_judge(buf.getvalue())
+        if not judge_response.get("success", False):
+            return
+
+        data = _extract_json(judge_response["response"])
+        verdicts = data.get("verdicts") if data else None
+        if not isinstance(verdicts, list):
+            return
+
+        for (i, prompt, candidates), provider_map, verdict in zip(
+            batch, provider_maps, verdicts
+        ):
+            try:
+                best_idx = int(verdict["selection"]) - 1
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not 0 <= best_idx < len(candidates):
+                continue
+
+            explanation = verdict.get("explanation")
+            if not isinstance(explanation, str):
+                explanation = "Selected based on overall quality assessment."
+            original_idx = provider_map[best_idx][0]
+            selected = candidates[original_idx]
+            reason = f"Selected response {best_idx+1}"
+
+            fingerprint = self._response_fingerprint(candidates)
+            self._remember_verdict(
+                self._verdict_key(prompt, fingerprint),
+                fingerprint,
+                None,
+                {
+                    "selected": self._canonical_order(candidates).index(original_idx),
+                    "reason": reason,
+                    "explanation": explanation,
+                    "judge_response": judge_response["response"],
+                },
+            )
+
+            results[i] = self._compact(
+                {
+                    "result": selected["response"],
+                    "best_response": selected,
+                    "method": "select",
+                    "reason": reason,
+                    "explanation": explanation,
+                    "judge_response": judge_response["response"],
+                    "success": True,
+                }
+            )
+
+    async def _query_judge(self, prompt: str) -> Dict[str, Any]:
+        """Query the judge model, binned by prompt length if a batcher is configured."""
+        batcher = _judge_batcher()
+        if batcher is None:
+            return await self._limited_query(prompt)
+        return await batcher.submit(
+            len(prompt) // 4, lambda: self._limited_query(prompt)
+        )
+
+    async def _limited_query(self, prompt: str) -> Dict[str, Any]:
+        """Query the judge model within the shared concurrency limit and token budget."""
+        semaphore, token_budget = _judge_limits()
+        async with semaphore:
+            await token_budget.acquire(len(prompt) // 4 + _OUTPUT_TOKEN_ESTIMATE)
+            return await self.model.query(prompt, model=self.model_name)
+
+    async def _sample_judge(self, eval_prompt: str) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Query the judge num_judge_samples times concurrently.
+        Returns the successful judge responses and the last error message seen.
+        """
+        if self.num_judge_samples <= 1:
+            samples = [await self._query_judge(eval_prompt)]
+        else:
+            samples = await asyncio.gather(
+                *(
+                    self._query_judge(eval_prompt)
+                    for _ in range(self.num_judge_samples)
+                ),
+                return_exceptions=True,
+            )
+
+        successful = []
+        error = "Unknown error"
+        for sample in samples:
+            if isinstance(sample, BaseException):
+                error = str(sample)
+            elif sample.get("success", False):
+                successful.append(sample)
+            else:
+                error = sample.get("error", "Unknown error")
+
+        return successful, error
+
+    def _average_weights(
+        self, parsed: List[Tuple[Optional[List[float]], str]]
+    ) -> Tuple[List[float], str]:
+        """
+        Normalize the weight vectors of one or more judge samples and average them.
+        Returns a tuple of (weights, explanation), with empty weights if none are usable.
+        """
+        usable = []
+        for weights, explanation in parsed:
+            if weights is None:
+                continue
+            normalized = _normalize_weights(weights)
+            if normalized:
+                usable.append((normalized, explanation))
+
+        if not usable:
+            return [], parsed[0][1]
+        if len(usable) == 1:
+            return usable[0]
+
+        averaged = [
+            math.fsum(column) / len(usable) for column in zip(*(w for w, _ in usable))
+        ]
+        return averaged, usable[0][1]
+
+    def _vote_selection(
+        self, judge_responses: List[Dict[str, Any]], num_responses: int
+    ) -> Tuple[Optional[int], str, Dict[str, Any]]:
+        """
+        Pick the most common valid selection across judge samples.
+        Returns (selected_index, explanation, judge_response) from the first sample
+        that voted for the winner, or None as the index if no sample parsed.
+        """
+        votes = []
+        for judge_response in judge_responses:
+            idx, explanation = self._parse_selected_index(judge_response["response"])
+            if idx is not None and 0 <= idx < num_responses:
+                votes.append((idx, explanation, judge_response))
+
+        if not votes:
+            return None, "", judge_responses[0]
+
+        winner = Counter(idx for idx, _, _ in votes).most_common(1)[0][0]
+        return next(vote for vote in votes if vote[0] == winner)
+
+    def _response_fingerprint(self, responses: List[Dict[str, Any]]) -> str:
+        """Hash the set of response texts and the judging mode."""
+        texts = sorted(r["response"] for r in responses)
+        payload = json.dumps([texts, self.blend_responses])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _verdict_key(self, prompt: str, fingerprint: str) -> str:
+        """Hash the prompt together with a response fingerprint."""
+        payload = json.dumps([prompt, fingerprint])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def _embed_prompt(self, prompt: str) -> Optional[List[float]]:
+        """Embed the prompt as a unit vector, or return None if embedding fails."""
+        try:
+            vector = await self.model.embed(prompt, model=JUDGE_EMBEDDING_MODEL)
+        except Exception:
+            return None
+
+        norm = math.sqrt(sum(x * x for x in vector))
+        if not norm:
+            return None
+        return [x / norm for x in vector]
+
+    def _semantic_lookup(
+        self, embedding: List[float], fingerprint: str
+    ) -> Optional[Dict[str, Any]]:
+        """Return the verdict for the most similar cached prompt with the same responses."""
+        if self.semantic_threshold is None:
+            return None
+
+        now = time.monotonic()
+        best_verdict = None
+        best_similarity = self.semantic_threshold
+
+        for (
+            expires_at,
+            cached_embedding,
+            cached_fingerprint,
+            verdict,
+        ) in self._semantic_cache:
+            if expires_at < now or cached_fingerprint != fingerprint:
+                continue
+            # Both vectors are normalized, so the dot product is the cosine similarity
+            similarity = sum(a * b for a, b in zip(embedding, cached_embedding))
+            if similarity >= best_similarity:
+                best_verdict, best_similarity = verdict, similarity
+
+        return best_verdict
+
+    def _remember_verdict(
+        self,
+        verdict_key: str,
+        fingerprint: str,
+        embedding: Optional[List[float]],
+        verdict: Dict[str, Any],
+    ) -> None:
+        """Store a verdict in the exact cache and, if embedded, the semantic cache."""
+        self._verdict_cache.set(verdict_key, verdict)
+        if embedding is not None:
+            self._semantic_cache.append(
+                (time.monotonic() + JUDGE_CACHE_TTL, embedding, fingerprint, verdict)
+            )
+
+    def _canonical_order(self, responses: List[Dict[str, Any]]) -> List[int]:
+        """
+        Order response indices by response text.
+
+        Cached verdicts refer to responses by position in this order, so they
+        can be applied regardless of provider order or anonymization shuffle.
+        """
+        return sorted(range(len(responses)), key=lambda i: responses[i]["response"])
+
+    def _from_cached_verdict(
+        self,
+        verdict: Dict[str, Any],
+        responses: List[Dict[str, Any]],
+        groups: List[List[int]],
+        order: List[int],
+    ) -> Dict[str, Any]:
+        """Rebuild an evaluation result from a cached verdict."""
+        if self.blend_responses:
+            original_responses, original_weights = self._expand_duplicates(
+                responses, groups, list(zip(order, verdict["weights"]))
+            )
+            return {
+                "result": verdict["result"],
+                "weights": original_weights,
+                "responses": original_responses,
+                "method": verdict["method"],
+                "explanation": verdict["explanation"],
+                "judge_response": verdict["judge_response"],
+                "success": True,
+            }
+
+        selected = responses[groups[order[verdict["selected"]]][0]]
+        return {
+            "result": selected["response"],
+            "best_response": selected,
+            "method": "select",
+            "reason": verdict["reason"],
+            "explanation": verdict["explanation"],
+            "judge_response": verdict["judge_response"],
+            "success": True,
+        }
+
     def _anonymize_responses(
         self, responses: List[Dict[str, Any]]
-    ) -> Tuple[List[Dict[str, Any]], Dict[int, Tuple[int, str, str]]]:
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[int, str, str]]]:
         """
         Anonymize responses by removing provider information and shuffling order.
-        Returns anonymized responses and a mapping from anonymized index to original index.
+        Returns anonymized responses and a list mapping anonymized index to original index.
         """
-        # Create a list of indices and shuffle
-        indices = list(range(len(responses)))
-        random.shuffle(indices)
+        # Shuffle the presentation order; two responses only need a coin flip
+        num_responses = len(responses)
+        if num_responses == 2:
+            indices = [1, 0] if self._rng.random() < 0.5 else [0, 1]
+        else:
+            indices = list(range(num_responses))
+            if num_responses > 2:
+                self._rng.shuffle(indices)
 
         # Create anonymized responses
         anonymized = []
-        # Map from anonymized index to (original_index, provider, model)
-        provider_map = {}
+        # Indexed by anonymized index: (original_index, provider, model)
+        provider_map: List[Tuple[int, str, str]] = []
 
         for anon_idx, orig_idx in enumerate(indices):
             resp = responses[orig_idx]
@@ -191,7 +996,7 @@ class Judge:
                     "success": resp["success"],
                 }
             )
-            provider_map[anon_idx] = (orig_idx, resp["provider"], resp["model"])
+            provider_map.append((orig_idx, resp["provider"], resp["model"]))
 
         return anonymized, provider_map
 
@@ -202,66 +1007,16 @@ class Judge:
         blend_mode: bool = False,
     ) -> str:
         """Create a prompt for the judge model to evaluate responses."""
-        prompt_parts = [
-            "You are a fair and impartial judge evaluating responses from different AI models.",
-            "You must evaluate each response solely on its quality and merit, not based on which model produced it.",
-            f"Original prompt: {original_prompt}\n",
-            "Model responses:",
-        ]
-
-        for i, response in enumerate(responses, 1):
-            provider = response["provider"]
-            model = response["model"]
-            model_response = response["response"]
-
-            prompt_parts.append(
-                f"\n--- Response {i}: {provider} ({model}) ---\n{model_response}\n"
-            )
-
-        prompt_parts.append("\nEvaluate each response based on these criteria:")
-
-        criteria = [
-            "1. Accuracy: Is the information correct and reliable?",
-            "2. Completeness: Does it fully address all aspects of the prompt?",
-            "3. Clarity: Is it well-written, easy to understand, and well-structured?",
-            "4. Usefulness: How practical and helpful is the response?",
-            "5. Creativity: Where appropriate, does it show original thinking?",
-            "6. Reasoning: Does it demonstrate logical thinking and good judgment?",
-        ]
-        prompt_parts.extend(criteria)
-
-        prompt_parts.append(
-            "\nIMPORTANT: All responses come from equally capable models. Judge each response strictly on its quality as presented here."
-        )
+        buf = io.StringIO()
+        write = buf.write
 
-        if blend_mode:
-            prompt_parts.append("\nYOUR RESPONSE FORMAT:")
-            prompt_parts.append(
-                "1. Provide a brief explanation (1-2 sentences) of how you evaluated these responses."
-            )
-            prompt_parts.append(
-                "2. Assign a weight between 0 and 10 to each response based on overall quality."
-            )
-            prompt_parts.append(
-                'Format your response like this:\n{"explanation": "Your explanation here", "weights": [X, Y, Z]}'
-            )
-            prompt_parts.append(
-                "Where X, Y, Z are numbers between 0 and 10 representing the quality of each response."
-            )
-        else:
-            prompt_parts.append("\nYOUR RESPONSE FORMAT:")
-            prompt_parts.append(
-                "1. Provide a brief explanation (1-2 sentences) of why you selected the best response."
-            )
-            prompt_parts.append("2. Identify the number of the best response.")
-            prompt_parts.append(
-                'Format your response like this:\n{"explanation": "Your explanation here", "selection": N}'
-            )
-            prompt_parts.append(
-                "Where N is the number of the best response (e.g., 1, 2, or 3)."
-            )
+        write(_EVAL_HEADER)
+        write("Original prompt: %s\n\nModel responses:\n" % original_prompt)
+        _write_responses(write, responses)
+        write(_EVAL_CRITERIA)
+        write(_EVAL_FOOTER_BLEND if blend_mode else _EVAL_FOOTER_SELECT)
 
-        return "\n".join(prompt_parts)
+        return buf.getvalue()
 
     def _parse_selected_index(self, judge_text: str) -> Tuple[Optional[int], str]:
         """
@@ -274,11 +1029,8 @@ class Judge:
 
         try:
             # Try to extract JSON from the response
-            match = re.search(r"\{.*\}", judge_text)
-            if match:
-                json_str = match.group(0)
-                data = json.loads(json_str)
-
+            data = _extract_json(judge_text)
+            if data:
                 # Extract the explanation if available
                 if "explanation" in data and isinstance(data["explanation"], str):
                     explanation = data["explanation"]
@@ -287,12 +1039,12 @@ class Judge:
                 if "selection" in data and isinstance(data["selection"], (int, str)):
                     # Convert to 0-indexed
                     return int(data["selection"]) - 1, explanation
-        except:
+        except (ValueError, TypeError):
             pass
 
         # Fallback to previous parsing method
         # Clean the response text and try to extract a number
-        cleaned_text = judge_text.strip().replace("'", "").replace('"', "")
+        cleaned_text = judge_text.strip().translate(_QUOTE_TBL)
 
         try:
             # Try to convert the entire response to an integer
@@ -300,7 +1052,7 @@ class Judge:
             return response_idx, explanation
         except ValueError:
             # If that fails, search for digits in the text
-            match = re.search(r"\b(\d+)\b", cleaned_text)
+            match = _INT_RE.search(cleaned_text)
             if match:
                 return int(match.group(1)) - 1, explanation  # Convert to 0-indexed
 
@@ -308,13 +1060,13 @@ class Judge:
 
     def _parse_weights(
         self, judge_text: str, num_responses: int
-    ) -> Tuple[List[float], str]:
+    ) -> Tuple[Optional[List[float]], str]:
         """
         Parse the weights and explanation from the judge's response.
-        Returns a tuple of (weights, explanation).
+        Returns a tuple of (weights, explanation), with None as the weights if
+        none could be parsed.
         """
         # Default values
-        default_weights = [1.0 / num_responses] * num_responses
         default_explanation = (
             "Weights assigned based on quality assessment across multiple criteria."
         )
@@ -322,11 +1074,8 @@ class Judge:
 
         try:
             # Try to extract JSON from the response
-            match = re.search(r"\{.*\}", judge_text)
-            if match:
-                json_str = match.group(0)
-                data = json.loads(json_str)
-
+            data = _extract_json(judge_text)
+            if data:
                 # Extract the explanation if available
                 if "explanation" in data and isinstance(data["explanation"], str):
                     explanation = data["explanation"]
@@ -340,41 +1089,64 @@ class Judge:
                         isinstance(w, (int, float)) for w in weights
                     ):
                         return weights, explanation
-        except:
+        except (ValueError, TypeError):
             pass
 
         # If we can't parse JSON, try to extract a list of numbers
         try:
-            numbers = re.findall(r"[\d.]+", judge_text)
+            numbers = _NUM_RE.findall(judge_text)
             if len(numbers) == num_responses:
                 return [float(n) for n in numbers], explanation
-        except:
+        except (ValueError, TypeError):
             pass
 
-        # If all else fails, create equal weights
-        return default_weights, explanation
+        return None, explanation
 
     async def _blend_text_responses(
         self,
         original_prompt: str,
         responses: List[Dict[str, Any]],
         weights: List[float],
-    ) -> str:
-        """Blend text responses by asking the judge model to create a unified response."""
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> Optional[str]:
+        """
+        Blend text responses by asking the judge model to create a unified response.
+        Returns None if the blending call fails.
+        """
         # Create a blending prompt
         blend_prompt = self._create_blending_prompt(original_prompt, responses, weights)
 
-        # Ask the judge model to blend the responses
-        blend_response = await self.model.query(blend_prompt, model=self.model_name)
+        # Ask the judge model to blend the responses, streaming if requested
+        if on_token is not None:
+            blend_response = await self._stream_blend(blend_prompt, on_token)
+        else:
+            blend_response = await self._query_judge(blend_prompt)
 
         if not blend_response.get("success", False):
-            # If blending fails, return the highest weighted response
-            max_idx = weights.index(max(weights))
-            return responses[max_idx]["response"]
+            return None
 
         # Return the blended response
         return blend_response["response"]
 
+    async def _stream_blend(
+        self, blend_prompt: str, on_token: Callable[[str], None]
+    ) -> Dict[str, Any]:
+        """Stream the blending call, passing each chunk to on_token."""
+        semaphore, token_budget = _judge_limits()
+        chunks = []
+        async with semaphore:
+            await token_budget.acquire(len(blend_prompt) // 4 + _OUTPUT_TOKEN_ESTIMATE)
+            try:
+                async for chunk in self.model.query_stream(
+                    blend_prompt, model=self.model_name
+                ):
+                    chunks.append(chunk)
+                    on_token(chunk)
+            except Exception as e:
+                return {"error": str(e), "success": False}
+
+        return {"response": "".join(chunks), "success": True}
+
     def _create_blending_prompt(
         self,
         original_prompt: str,
@@ -382,35 +1154,25 @@ class Judge:
         weights: List[float],
     ) -> str:
         """Create a prompt for blending multiple responses according to weights."""
-        # Format weights as percentages
-        weight_percentages = [f"{w*100:.1f}%" for w in weights]
-
-        prompt_parts = [
-            "You are an expert at synthesizing information from multiple sources.",
-            f"Original prompt: {original_prompt}\n",
-            "You will be given multiple responses to this prompt with assigned weights.",
-            "Your task is to create a SINGLE COHERENT RESPONSE that:",
-            "1. Incorporates content from all responses according to their weights",
-            "2. Prioritizes information from higher-weighted responses",
-            "3. Resolves any contradictions by favoring higher-weighted responses",
-            "4. Maintains a consistent tone and style throughout",
-            "5. Forms a complete, well-structured answer to the original prompt\n",
-            "Responses with their weights:",
-        ]
+        buf = io.StringIO()
+        write = buf.write
 
-        for i, (response, weight_pct) in enumerate(
-            zip([r["response"] for r in responses], weight_percentages), 1
-        ):
-            provider = responses[i - 1]["provider"]
-            model = responses[i - 1]["model"]
-            prompt_parts.append(
-                f"\n--- Response {i} ({provider}, {model}, Weight: {weight_pct}) ---\n{response}\n"
+        write(_BLEND_HEADER)
+        write("Original prompt: %s\n\n" % original_prompt)
+        write(_BLEND_INSTRUCTIONS)
+
+        for i, (response, weight) in enumerate(zip(responses, weights), 1):
+            write(
+                "\n--- Response %d (%s, %s, Weight: %.1f%%) ---\n%s\n\n"
+                % (
+                    i,
+                    response["provider"],
+                    response["model"],
+                    weight * 100,
+                    response["response"],
+                )
             )
 
-        prompt_parts.append(
-            "\nNow, create a single coherent response that blends these sources according to their weights."
-            "\nDo not mention the weights or that this is a blend in your response."
-            "\nWrite in a natural, flowing style as if this was a single response from the beginning."
-        )
+        write(_BLEND_FOOTER)
 
-        return "\n".join(prompt_parts)
+        return buf.getvalue()
@@ -310,7 +310,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     }
     
                     // If we're in blend mode, add weight breakdown
-                    if (data.details.method === 'blend' && data.details.weights && data.details.responses) {
+                    if ((data.details.method === 'blend' || data.details.method === 'blend_shortcircuit') && data.details.weights && data.details.responses) {
                         const weightBreakdown = createBlendExplanation(data.details.responses, data.details.weights);
                         explanationContent += weightBreakdown;
                     }
@@ -1,11 +1,31 @@
-from .helpers import (
-    load_env_file,
-    format_response,
-    create_default_env_file,
-)
+import importlib
+from typing import Any
+
+# Submodules are loaded on first access so importing one helper stays cheap
+_LAZY_ATTRS = {
+    "load_env_file": ".helpers",
+    "format_response": ".helpers",
+    "create_default_env_file": ".helpers",
+    "TTLCache": ".cache",
+    "make_cache_key": ".cache",
+    "TokenBucket": ".rate_limit",
+}
 
 __all__ = [
     "load_env_file",
     "format_response",
     "create_default_env_file",
+    "TTLCache",
+    "make_cache_key",
+    "TokenBucket",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+        # Cache on the package so later lookups skip __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,61 @@
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def make_cache_key(prompt: str, model_configs: Dict[str, str], blend: bool) -> str:
+    """Build a stable cache key for a comparison request."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(prompt.encode("utf-8"))
+    for provider, model in sorted(model_configs.items()):
+        digest.update(f"\0{provider}={model}".encode("utf-8"))
+    digest.update(b"\0blend" if blend else b"\0select")
+    return digest.hexdigest()
+
+
+class TTLCache:
+    """A small in-memory LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the oldest
+            ttl: Number of seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        if self.maxsize <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,21 +1,79 @@
 import os
-import json
-from typing import Dict, Any
+import orjson
+from functools import lru_cache
+from typing import Dict, Any, MutableMapping, Optional, Tuple
 
+# Contents written by create_default_env_file
+DEFAULT_ENV_CONTENT = b"""# OpenAI API Key
+OPENAI_API_KEY=
+
+# Anthropic API Key
+ANTHROPIC_API_KEY=
+
+# Google AI (Gemini) API Key
+GEMINI_API_KEY=
+
+# Judge model settings
+JUDGE_MODEL_PROVIDER=openai
+JUDGE_MODEL=gpt-4o-2024-11-20
 
-def load_env_file(filepath: str = ".env") -> None:
-    """Load environment variables from a .env file if it exists."""
-    if not os.path.exists(filepath):
+# Server settings
+HOST=0.0.0.0
+PORT=8000
+"""
+
+
+def load_env_file(
+    filepath: str = ".env", environ: Optional[MutableMapping[str, str]] = None
+) -> None:
+    """
+    Load environment variables from a .env file if it exists.
+
+    Variables already set in the environment take precedence over the file.
+    Values are loaded into os.environ unless another mapping is given.
+    """
+    if environ is None:
+        environ = os.environ
+
+    try:
+        mtime = os.stat(filepath).st_mtime_ns
+    except OSError:
         return
 
-    with open(filepath, "r") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
+    environ.update(
+        {key: value for key, value in _parse_env(filepath, mtime) if key not in environ}
+    )
+
+
+@lru_cache(maxsize=1)
+def _parse_env(filepath: str, mtime: int) -> Tuple[Tuple[str, str], ...]:
+    """Parse KEY=VALUE pairs from an env file, cached until the file changes."""
+    with open(filepath, "rb") as f:
+        text = f.read().decode("utf-8")
+
+    pairs = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] == "#" or "=" not in line:
+            continue
 
-            key, value = line.split("=", 1)
-            os.environ[key] = value
+        if line.startswith("export "):
+            line = line[len("export ") :]
+
+        key, _, value = line.partition("=")
+        key, value = key.strip(), value.strip()
+
+        # Strip matching surrounding quotes
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+            value = value[1:-1]
+
+        pairs.append((key, value))
+
+    return tuple(pairs)
+
+
+# Keys format_response keeps at the top level rather than in details
+_TOP_LEVEL_KEYS = frozenset({"result", "success"})
 
 
 def format_response(
@@ -33,7 +91,7 @@ def format_response(
     explanation = data.get("explanation")
 
     # Create details dictionary
-    details = {k: v for k, v in data.items() if k not in ["result", "success"]}
+    details = {k: v for k, v in data.items() if k not in _TOP_LEVEL_KEYS}
 
     # Detailed response with evaluation information
     formatted_response = {
@@ -49,8 +107,8 @@ def format_response(
 
 def save_to_file(filepath: str, data: Dict[str, Any]) -> None:
     """Save data to a JSON file."""
-    with open(filepath, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(filepath, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
 
 def create_default_env_file(output_path: str = ".env") -> None:
@@ -58,23 +116,5 @@ def create_default_env_file(output_path: str = ".env") -> None:
     if os.path.exists(output_path):
         return
 
-    # Create a minimal .env file
-    default_content = """# OpenAI API Key
-OPENAI_API_KEY=
-
-# Anthropic API Key
-ANTHROPIC_API_KEY=
-
-# Google AI (Gemini) API Key
-GEMINI_API_KEY=
-
-# Judge model settings
-JUDGE_MODEL_PROVIDER=openai
-JUDGE_MODEL=gpt-4o-2024-11-20
-
-# Server settings
-HOST=0.0.0.0
-PORT=8000
-"""
-    with open(output_path, "w") as f:
-        f.write(default_content)
+    with open(output_path, "wb") as f:
+        f.write(DEFAULT_ENV_CONTENT)
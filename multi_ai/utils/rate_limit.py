@@ -0,0 +1,47 @@
+import time
+import asyncio
+
+
+class TokenBucket:
+    """An async token bucket limiting how many requests (or units of cost) start per minute."""
+
+    def __init__(self, requests_per_minute: float) -> None:
+        """
+        Initialize the bucket.
+
+        Args:
+            requests_per_minute: Sustained request rate; 0 or less disables limiting
+        """
+        self.rate = requests_per_minute / 60.0
+        # Allow at most one second's worth of requests as a burst
+        self.capacity = max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, cost: float = 1.0) -> None:
+        """
+        Wait until enough tokens are available and consume them.
+
+        A cost larger than the bucket's capacity waits for a full bucket and
+        leaves it in debt, so later callers wait for the excess to refill.
+        """
+        if self.rate <= 0:
+            return
+
+        needed = min(cost, self.capacity)
+
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+            if self._tokens < needed:
+                # The lock is held while sleeping, so the refill is ours alone
+                await asyncio.sleep((needed - self._tokens) / self.rate)
+                self._tokens = needed
+                self._updated = time.monotonic()
+
+            self._tokens -= cost
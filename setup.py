@@ -10,13 +10,15 @@ setup(
     install_requires=[
         "fastapi>=0.104.1",
         "uvicorn>=0.24.0",
-        "python-dotenv>=1.0.0",
+        "uvloop; sys_platform != 'win32'",
+        "httptools",
         "openai>=1.3.5",
         "anthropic",
         "jinja2",
         "pydantic>=2.4.2",
-        "httpx>=0.25.1",
+        "httpx[http2]>=0.25.1",
         "markdown2",
+        "orjson",
     ],
     classifiers=[
         "Programming Language :: Python :: 3",
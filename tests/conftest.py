@@ -1,9 +1,10 @@
 import os
+import asyncio
 import pytest
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any
 import sys
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock
 
 
 # Add project root to Python path to find modules
@@ -12,13 +13,63 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 
-# Configure pytest-asyncio
-def pytest_configure(config):
+# Mocked judge flows finish in milliseconds; anything slower is accidental I/O
+JUDGE_EVALUATE_TIMEOUT = 1
+
+
+def pytest_collection_modifyitems(config, items):
+    """Give judge_evaluate tests a short hard timeout unless they set their own."""
+    for item in items:
+        if item.get_closest_marker("judge_evaluate") and not item.get_closest_marker(
+            "timeout"
+        ):
+            item.add_marker(pytest.mark.timeout(JUDGE_EVALUATE_TIMEOUT))
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """
+    Share one event loop across the async tests of each module.
+
+    pytest-asyncio otherwise creates and closes a loop for every test, which
+    costs more than most of these mock-backed test bodies.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+async def app_client():
     """
-    Configure pytest with custom markers and settings.
-    This ensures async tests are properly recognized and executed.
+    An in-loop httpx client for the app, with the lifespan run once per module.
+
+    ASGITransport calls the app directly on the test's event loop, avoiding
+    the worker thread TestClient hops through on every request. It's module
+    scoped to match the event loop; the app is imported here rather than at
+    module level so that importing this conftest doesn't pull in the
+    provider SDKs.
     """
-    config.addinivalue_line("markers", "asyncio: mark test as async")
+    from httpx import ASGITransport, AsyncClient
+    from multi_ai.api import app
+
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            yield client
+
+
+@pytest.fixture
+def client(app_client):
+    """The shared API client, with dependency overrides restored after each test."""
+    from multi_ai.api import app
+
+    overrides = app.dependency_overrides
+    saved = dict(overrides)
+    yield app_client
+    overrides.clear()
+    overrides.update(saved)
 
 
 @pytest.fixture(autouse=True)
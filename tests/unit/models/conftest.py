@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def prompt():
+    """Prompt sent by the model tests."""
+    return "Test prompt"
+
+
+@pytest.fixture(scope="session")
+def model_name():
+    """Model name passed explicitly by the model tests."""
+    return "test-model"
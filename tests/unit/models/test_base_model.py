@@ -1,13 +1,18 @@
-import os
 import pytest
-from unittest.mock import patch, AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 from multi_ai.models.base_model import BaseModel
 
 # Test constants
 TEST_API_KEY = "test-api-key-123"
 TEST_ENV_VAR = "TEST_API_KEY"
-TEST_PROMPT = "Test prompt for the model"
-TEST_MODEL = "test-model-v1"
+STUB_CLIENT = object()
+
+
+class _TestableBase(BaseModel):
+    """BaseModel whose client setup needs no SDK."""
+
+    def initialize_client(self) -> None:
+        self.client = STUB_CLIENT
 
 
 @pytest.fixture
@@ -16,22 +21,20 @@ def base_model():
     Create a base model instance for testing.
 
     This fixture creates a BaseModel instance with necessary mocking:
-    - Patches the initialize_client method to avoid real API initialization
+    - Uses a subclass with a stub client to avoid real API initialization
     - Provides a concrete implementation of the abstract _execute_query method
     - Sets up a predictable success response for testing
 
     Returns:
         A configured BaseModel instance ready for testing
     """
-    with patch.object(BaseModel, "initialize_client"):
-        model = BaseModel(api_key=TEST_API_KEY)
-        # Since BaseModel._execute_query is abstract, provide a concrete implementation for testing
-        model._execute_query = AsyncMock(return_value="Test response")
-        return model
+    model = _TestableBase(api_key=TEST_API_KEY)
+    # Since BaseModel._execute_query is abstract, provide a concrete implementation for testing
+    model._execute_query = AsyncMock(return_value="Test response")
+    return model
 
 
 class TestBaseModel:
-
     def test_init_with_direct_api_key(self):
         """
         Test initialization with a directly provided API key.
@@ -39,12 +42,10 @@ class TestBaseModel:
         Verifies that when an API key is provided directly to the constructor,
         it is correctly stored in the model instance and the provider name is set.
         """
-        with patch.object(BaseModel, "initialize_client"):
-            model = BaseModel(api_key=TEST_API_KEY)
-            assert model.api_key == TEST_API_KEY, "API key should be stored directly"
-            assert (
-                model.provider_name == "Base"
-            ), "Default provider name should be 'Base'"
+        model = _TestableBase(api_key=TEST_API_KEY)
+        assert model.api_key == TEST_API_KEY, "API key should be stored directly"
+        assert model.provider_name == "Base", "Default provider name should be 'Base'"
+        assert model.client is STUB_CLIENT, "Client should be initialized"
 
     def test_init_with_env_var(self, monkeypatch):
         """
@@ -61,16 +62,44 @@ class TestBaseModel:
         monkeypatch.setenv(TEST_ENV_VAR, env_api_key)
 
         # Create model with only the environment variable name
-        with patch.object(BaseModel, "initialize_client"):
-            model = BaseModel(env_var_name=TEST_ENV_VAR)
+        model = _TestableBase(env_var_name=TEST_ENV_VAR)
+
+        # Verify the API key was retrieved from environment
+        assert (
+            model.api_key == env_api_key
+        ), "API key should be retrieved from environment"
+
+    def test_init_without_api_key_skips_client(self, monkeypatch):
+        """
+        Test initialization when no API key is available.
 
-            # Verify the API key was retrieved from environment
-            assert (
-                model.api_key == env_api_key
-            ), "API key should be retrieved from environment"
+        Verifies that the client is not initialized when there is no key,
+        since it could only fail on first use.
+        """
+        monkeypatch.delenv(TEST_ENV_VAR, raising=False)
+
+        model = _TestableBase(env_var_name=TEST_ENV_VAR)
+
+        assert model.client is None
+
+    async def test_query_without_api_key(self, monkeypatch, prompt, model_name):
+        """
+        Test that querying without an API key fails fast.
 
-    @pytest.mark.asyncio
-    async def test_query_success(self, base_model):
+        Verifies that the error response names the missing environment variable
+        and that no API call is attempted.
+        """
+        monkeypatch.delenv(TEST_ENV_VAR, raising=False)
+        model = BaseModel(env_var_name=TEST_ENV_VAR)
+        model._execute_query = AsyncMock()
+
+        result = await model.query(prompt, model_name)
+
+        assert result["success"] is False
+        assert TEST_ENV_VAR in result["error"]
+        model._execute_query.assert_not_called()
+
+    async def test_query_success(self, base_model, prompt, model_name):
         """
         Test successful query execution.
 
@@ -83,11 +112,11 @@ class TestBaseModel:
             base_model: The fixture providing a pre-configured BaseModel instance
         """
         # Call the query method with test parameters
-        result = await base_model.query(TEST_PROMPT, TEST_MODEL)
+        result = await base_model.query(prompt, model_name)
 
         # Verify the result structure and content
         assert result["provider"] == "Base", "Provider name should be included"
-        assert result["model"] == TEST_MODEL, "Model name should match the input"
+        assert result["model"] == model_name, "Model name should match the input"
         assert (
             result["response"] == "Test response"
         ), "Response should match mock return value"
@@ -96,10 +125,9 @@ class TestBaseModel:
         ), "Success flag should be True for successful queries"
 
         # Verify the underlying _execute_query was called correctly
-        base_model._execute_query.assert_called_once_with(TEST_PROMPT, TEST_MODEL)
+        base_model._execute_query.assert_called_once_with(prompt, model_name)
 
-    @pytest.mark.asyncio
-    async def test_query_failure(self, base_model):
+    async def test_query_failure(self, base_model, prompt, model_name):
         """
         Test query execution with an exception.
 
@@ -117,20 +145,19 @@ class TestBaseModel:
         base_model._execute_query = AsyncMock(side_effect=Exception(error_message))
 
         # Call the query method
-        result = await base_model.query(TEST_PROMPT, TEST_MODEL)
+        result = await base_model.query(prompt, model_name)
 
         # Verify the error response structure and content
         assert (
             result["provider"] == "Base"
         ), "Provider name should be included even in errors"
-        assert result["model"] == TEST_MODEL, "Model name should match the input"
+        assert result["model"] == model_name, "Model name should match the input"
         assert (
             result["error"] == error_message
         ), "Error message should match the exception"
         assert result["success"] is False, "Success flag should be False for errors"
 
-    @pytest.mark.asyncio
-    async def test_execute_query_raises_not_implemented(self):
+    async def test_execute_query_raises_not_implemented(self, prompt, model_name):
         """
         Test that _execute_query raises NotImplementedError if not overridden.
 
@@ -141,14 +168,51 @@ class TestBaseModel:
         This ensures subclasses are forced to implement the method.
         """
         # Create a model with the base implementation (no mock override)
-        with patch.object(BaseModel, "initialize_client"):
-            # Explicitly provide an API key to avoid the env_var_name=None issue
-            model = BaseModel(api_key=TEST_API_KEY, env_var_name=TEST_ENV_VAR)
+        # Explicitly provide an API key to avoid the env_var_name=None issue
+        model = _TestableBase(api_key=TEST_API_KEY, env_var_name=TEST_ENV_VAR)
+
+        # Since this is a coroutine function, we need to await it
+        # and check that it raises the right exception
+        with pytest.raises(NotImplementedError) as excinfo:
+            await model._execute_query(prompt, model_name)
+
+        # Verify the error message is informative
+        assert str(excinfo.value) == "Subclasses must implement _execute_query"
+
+    def test_require_client(self, monkeypatch):
+        """
+        Test that _require_client returns the client or raises without one.
+
+        Models built without an API key never create a client, so the
+        provider methods that need one fail with a clear error instead of
+        an AttributeError on None.
+        """
+        model = _TestableBase(api_key=TEST_API_KEY)
+        assert model._require_client() is STUB_CLIENT
 
-            # Since this is a coroutine function, we need to await it
-            # and check that it raises the right exception
-            with pytest.raises(NotImplementedError) as excinfo:
-                await model._execute_query(TEST_PROMPT, TEST_MODEL)
+        monkeypatch.delenv(TEST_ENV_VAR, raising=False)
+        keyless = _TestableBase(env_var_name=TEST_ENV_VAR)
+        with pytest.raises(RuntimeError, match=TEST_ENV_VAR):
+            keyless._require_client()
 
-            # Verify the error message is informative
-            assert str(excinfo.value) == "Subclasses must implement _execute_query"
+    async def test_query_stream_default(self, base_model, prompt, model_name):
+        """
+        Test that the default query_stream yields the whole response once.
+
+        Providers without native streaming still satisfy the streaming
+        interface the judge uses for blending.
+        """
+        chunks = [chunk async for chunk in base_model.query_stream(prompt, model_name)]
+
+        assert chunks == ["Test response"]
+        base_model._execute_query.assert_called_once_with(prompt, model_name)
+
+    async def test_embed_not_supported(self, base_model):
+        """
+        Test that embed raises NotImplementedError unless a provider overrides it.
+
+        The judge treats this like any embedding failure and skips its
+        semantic cache.
+        """
+        with pytest.raises(NotImplementedError, match="does not support embeddings"):
+            await base_model.embed("Test text", model="embedding-model")
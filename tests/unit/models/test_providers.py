@@ -0,0 +1,284 @@
+import pytest
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Type
+from multi_ai.models.base_model import BaseModel
+from multi_ai.models.anthropic_model import AnthropicModel
+from multi_ai.models.openai_model import OpenAIModel
+from multi_ai.models.gemini_model import GeminiModel
+from multi_ai.config import (
+    ANTHROPIC_DEFAULT_MODEL,
+    OPENAI_DEFAULT_MODEL,
+    GEMINI_DEFAULT_MODEL,
+    DEFAULT_TIMEOUT,
+)
+
+
+class FakeMethod:
+    """SDK method stub that records keyword arguments and returns a canned response."""
+
+    def __init__(self, response: Any) -> None:
+        self.response = response
+        self.error: Optional[Exception] = None
+        self.calls: List[Dict[str, Any]] = []
+
+    def __call__(self, **kwargs: Any) -> Any:
+        self.calls.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+class FakeAsyncMethod(FakeMethod):
+    async def __call__(self, **kwargs: Any) -> Any:
+        return super().__call__(**kwargs)
+
+
+ANTHROPIC_TEXT = "This is a test response from Anthropic"
+OPENAI_TEXT = "This is a test response from OpenAI"
+GEMINI_TEXT = "This is a test response from Google Gemini"
+
+# Canned SDK responses; nothing mutates them, so every test shares one copy
+ANTHROPIC_RESPONSE = SimpleNamespace(content=[SimpleNamespace(text=ANTHROPIC_TEXT)])
+OPENAI_RESPONSE = SimpleNamespace(
+    choices=[SimpleNamespace(message=SimpleNamespace(content=OPENAI_TEXT))]
+)
+OPENAI_EMBEDDING = SimpleNamespace(data=[SimpleNamespace(embedding=[0.1, 0.2, 0.3])])
+GEMINI_RESPONSE = SimpleNamespace(text=GEMINI_TEXT)
+
+
+class FakeAnthropic:
+    def __init__(self) -> None:
+        self.messages = SimpleNamespace(create=FakeAsyncMethod(ANTHROPIC_RESPONSE))
+
+
+class FakeOpenAI:
+    def __init__(self) -> None:
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(create=FakeAsyncMethod(OPENAI_RESPONSE))
+        )
+        self.embeddings = SimpleNamespace(create=FakeAsyncMethod(OPENAI_EMBEDDING))
+
+
+class FakeGenAI:
+    def __init__(self) -> None:
+        self.models = SimpleNamespace(generate_content=FakeMethod(GEMINI_RESPONSE))
+        self.aio = SimpleNamespace(
+            models=SimpleNamespace(generate_content=FakeAsyncMethod(GEMINI_RESPONSE))
+        )
+
+
+@dataclass(frozen=True)
+class ProviderSpec:
+    """Everything that differs between the provider model tests."""
+
+    patch_target: str
+    model_cls: Type[BaseModel]
+    env_var: str
+    default_model: str
+    provider_name: str
+    response_text: str
+    fake_cls: Callable[[], Any]
+    # The SDK method each provider awaits to answer a query
+    query_method: Callable[[Any], FakeMethod]
+    # Keyword arguments the provider SDK should be called with
+    expected_call: Callable[[str, str], Dict[str, Any]]
+
+
+ANTHROPIC = ProviderSpec(
+    patch_target="anthropic.AsyncAnthropic",
+    model_cls=AnthropicModel,
+    env_var="ANTHROPIC_API_KEY",
+    default_model=ANTHROPIC_DEFAULT_MODEL,
+    provider_name="Anthropic",
+    response_text=ANTHROPIC_TEXT,
+    fake_cls=FakeAnthropic,
+    query_method=lambda client: client.messages.create,
+    expected_call=lambda prompt, name: {
+        "model": name,
+        "max_tokens": 4000,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.7,
+    },
+)
+
+OPENAI = ProviderSpec(
+    patch_target="openai.AsyncOpenAI",
+    model_cls=OpenAIModel,
+    env_var="OPENAI_API_KEY",
+    default_model=OPENAI_DEFAULT_MODEL,
+    provider_name="OpenAI",
+    response_text=OPENAI_TEXT,
+    fake_cls=FakeOpenAI,
+    query_method=lambda client: client.chat.completions.create,
+    expected_call=lambda prompt, name: {
+        "model": name,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.7,
+        "timeout": DEFAULT_TIMEOUT,
+    },
+)
+
+GEMINI = ProviderSpec(
+    patch_target="google.genai.client.Client",
+    model_cls=GeminiModel,
+    env_var="GEMINI_API_KEY",
+    default_model=GEMINI_DEFAULT_MODEL,
+    provider_name="Google Gemini",
+    response_text=GEMINI_TEXT,
+    fake_cls=FakeGenAI,
+    query_method=lambda client: client.aio.models.generate_content,
+    expected_call=lambda prompt, name: {"contents": prompt, "model": name},
+)
+
+PROVIDERS = [ANTHROPIC, OPENAI, GEMINI]
+PROVIDER_IDS = ["anthropic", "openai", "gemini"]
+
+
+@pytest.fixture(scope="module", params=PROVIDERS, ids=PROVIDER_IDS)
+def provider_spec(request):
+    return request.param
+
+
+@pytest.fixture
+def fake_client(provider_spec, monkeypatch):
+    """Swap the provider SDK client for a fresh stub."""
+    client = provider_spec.fake_cls()
+    monkeypatch.setattr(provider_spec.patch_target, lambda **kwargs: client)
+    return client
+
+
+@pytest.fixture(scope="module")
+def expected_calls(provider_spec, prompt, model_name):
+    """SDK call kwargs keyed by the model queried, built once per provider."""
+    return {
+        name: provider_spec.expected_call(prompt, name)
+        for name in (model_name, provider_spec.default_model)
+    }
+
+
+@pytest.fixture
+def query_method(provider_spec, fake_client):
+    return provider_spec.query_method(fake_client)
+
+
+@pytest.fixture
+def provider_model(provider_spec, fake_client):
+    return provider_spec.model_cls(api_key="test_key")
+
+
+class TestProviders:
+    def test_init_direct(self, provider_spec, fake_client):
+        """Test that the model initializes correctly with an explicit key."""
+        model = provider_spec.model_cls(api_key="test_key")
+        assert model.api_key == "test_key"
+        assert model.provider_name == provider_spec.provider_name
+        assert model.client is fake_client
+
+    def test_init_env(self, provider_spec, monkeypatch, fake_client):
+        """Test initialization using the provider's environment variable."""
+        monkeypatch.setenv(provider_spec.env_var, "env_test_key")
+        model = provider_spec.model_cls()
+        assert model.api_key == "env_test_key"
+
+    async def test_execute_query(
+        self,
+        provider_spec,
+        provider_model,
+        query_method,
+        expected_calls,
+        prompt,
+        model_name,
+    ):
+        """Test that _execute_query calls the provider API correctly."""
+        result = await provider_model._execute_query(prompt, model_name)
+
+        assert query_method.calls == [expected_calls[model_name]]
+        assert result == provider_spec.response_text
+
+    async def test_execute_query_default(
+        self, provider_spec, provider_model, query_method, expected_calls, prompt
+    ):
+        """Test that _execute_query uses the default model when none is specified."""
+        await provider_model._execute_query(prompt)
+
+        assert query_method.calls == [expected_calls[provider_spec.default_model]]
+
+    async def test_query_integration(
+        self, provider_spec, provider_model, prompt, model_name
+    ):
+        """Test the full query method from the parent class using each provider."""
+        result = await provider_model.query(prompt, model_name)
+
+        assert result["provider"] == provider_spec.provider_name
+        assert result["model"] == model_name
+        assert result["response"] == provider_spec.response_text
+        assert result["success"] is True
+
+
+@pytest.mark.parametrize("provider_spec", [OPENAI], ids=["openai"], indirect=True)
+class TestOpenAIModel:
+    async def test_embed(self, provider_model, fake_client):
+        """Test that embed returns the embedding vector from the API."""
+        result = await provider_model.embed("Test text", model="text-embedding-3-small")
+
+        assert fake_client.embeddings.create.calls == [
+            {
+                "model": "text-embedding-3-small",
+                "input": "Test text",
+                "timeout": provider_model.timeout,
+            }
+        ]
+        assert result == [0.1, 0.2, 0.3]
+
+
+@pytest.mark.parametrize("provider_spec", [GEMINI], ids=["gemini"], indirect=True)
+class TestGeminiModel:
+    def test_run_gemini_query(
+        self, provider_model, fake_client, expected_calls, prompt, model_name
+    ):
+        """Test the synchronous Gemini query function."""
+        result = provider_model._run_gemini_query(prompt, model_name)
+
+        assert fake_client.models.generate_content.calls == [expected_calls[model_name]]
+        assert result == GEMINI_TEXT
+
+    async def test_execute_query_uses_async_client(
+        self, provider_model, fake_client, prompt, model_name
+    ):
+        """Test that _execute_query prefers the native async client."""
+        await provider_model._execute_query(prompt, model_name)
+
+        assert fake_client.models.generate_content.calls == []
+
+    async def test_execute_query_executor_fallback(
+        self, provider_model, fake_client, expected_calls, prompt, model_name
+    ):
+        """Test that _execute_query falls back to a thread pool without async support."""
+        # Simulate an SDK without the async surface
+        fake_client.aio = None
+
+        result = await provider_model._execute_query(prompt, model_name)
+
+        # Check the sync client was called with correct args
+        assert fake_client.models.generate_content.calls == [expected_calls[model_name]]
+        assert result == GEMINI_TEXT
+
+        # The dedicated executor is created once and reused
+        executor = provider_model._executor
+        assert executor is not None
+        await provider_model._execute_query(prompt, model_name)
+        assert provider_model._executor is executor
+
+    async def test_execute_query_error_handling(
+        self, provider_model, fake_client, prompt
+    ):
+        """Test that _execute_query properly handles errors."""
+        # Make the async API call raise an exception
+        fake_client.aio.models.generate_content.error = Exception("API error")
+
+        # Check that the exception is propagated
+        with pytest.raises(Exception) as e:
+            await provider_model._execute_query(prompt)
+
+        assert str(e.value) == "API error"
@@ -0,0 +1,102 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+from multi_ai.models import registry
+from multi_ai.models.registry import (
+    get_model,
+    get_models,
+    provider_limits,
+    get_http_client,
+    close_http_client,
+)
+
+
+@pytest.fixture
+def clean_registry():
+    get_model.cache_clear()
+    yield
+    get_model.cache_clear()
+
+
+class TestRegistry:
+    def test_get_model_is_cached(self, clean_registry):
+        """Test that each provider's model is created once and then reused."""
+        with patch("multi_ai.models.openai_model.OpenAIModel") as mock_openai:
+            mock_openai.return_value = MagicMock()
+
+            first = get_model("openai")
+            second = get_model("openai")
+
+            assert first is second
+            mock_openai.assert_called_once_with()
+
+    def test_get_model_unsupported_provider(self, clean_registry):
+        """Test that unknown providers are rejected."""
+        with pytest.raises(ValueError) as e:
+            get_model("unsupported")
+
+        assert "Unsupported model provider: unsupported" in str(e.value)
+
+    def test_get_models(self, clean_registry):
+        """Test that get_models returns every registered provider."""
+        with patch("multi_ai.models.openai_model.OpenAIModel"), patch(
+            "multi_ai.models.anthropic_model.AnthropicModel"
+        ), patch("multi_ai.models.gemini_model.GeminiModel"):
+            models = get_models()
+
+        assert set(models) == {"openai", "anthropic", "gemini"}
+
+    def test_provider_limits_are_shared(self, monkeypatch):
+        """Test that every caller draws on one budget per provider, read from env."""
+        monkeypatch.setenv("ANTHROPIC_MAX_INFLIGHT", "3")
+        provider_limits.cache_clear()
+        try:
+            semaphore, rate_limiter = provider_limits("anthropic")
+
+            assert provider_limits("anthropic") == (semaphore, rate_limiter)
+            assert provider_limits("openai")[0] is not semaphore
+            assert semaphore._value == 3
+            with pytest.raises(ValueError, match="Unsupported model provider"):
+                provider_limits("unsupported")
+        finally:
+            provider_limits.cache_clear()
+
+    async def test_http_client_shared_until_closed(self):
+        """Test that the shared HTTP client is reused and recreated after closing."""
+        await close_http_client()
+
+        client = get_http_client()
+        assert get_http_client() is client
+
+        await close_http_client()
+        assert client.is_closed
+        assert registry._http_client is None
+
+    async def test_openai_model_survives_http_client_close(
+        self, clean_registry, monkeypatch
+    ):
+        """Test that the shared OpenAI model rebinds after the HTTP client closes."""
+        bound = []
+
+        async def create(**kwargs):
+            assert not bound[-1].is_closed
+            message = SimpleNamespace(content="ok")
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        def fake_openai(api_key, http_client):
+            bound.append(http_client)
+            completions = SimpleNamespace(create=create)
+            return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+        monkeypatch.setattr("openai.AsyncOpenAI", fake_openai)
+
+        model = get_model("openai")
+        await close_http_client()
+        result = await get_model("openai").query("Test prompt", "gpt-4")
+
+        assert result["success"] is True
+        assert result["response"] == "ok"
+        # The client was rebuilt on a fresh connection pool
+        assert len(bound) == 2 and bound[0].is_closed
+        assert get_model("openai") is model
+        await close_http_client()
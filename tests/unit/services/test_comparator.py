@@ -1,7 +1,15 @@
 import pytest
+from contextlib import ExitStack
 from unittest.mock import patch, AsyncMock, MagicMock
 import asyncio
 from multi_ai.services.comparator import Comparator
+from multi_ai.services.judge import Judge
+from multi_ai.utils.cache import make_cache_key
+from multi_ai.utils.rate_limit import TokenBucket
+from multi_ai.models.registry import get_model, provider_limits
+from multi_ai.models.openai_model import OpenAIModel
+from multi_ai.models.anthropic_model import AnthropicModel
+from multi_ai.models.gemini_model import GeminiModel
 from multi_ai.config import (
     OPENAI_DEFAULT_MODEL,
     ANTHROPIC_DEFAULT_MODEL,
@@ -9,66 +17,187 @@ from multi_ai.config import (
 )
 
 
-@pytest.fixture
-def mock_models():
-    with patch("multi_ai.services.comparator.OpenAIModel") as mock_openai, patch(
-        "multi_ai.services.comparator.AnthropicModel"
-    ) as mock_anthropic, patch(
-        "multi_ai.services.comparator.GeminiModel"
-    ) as mock_gemini, patch(
-        "multi_ai.services.comparator.Judge"
-    ) as mock_judge:
-
-        # Setup model instances
-        mock_openai_instance = AsyncMock()
-        mock_anthropic_instance = AsyncMock()
-        mock_gemini_instance = AsyncMock()
-        mock_judge_instance = AsyncMock()
-
-        # Configure mock returns
-        mock_openai.return_value = mock_openai_instance
-        mock_anthropic.return_value = mock_anthropic_instance
-        mock_gemini.return_value = mock_gemini_instance
-        mock_judge.return_value = mock_judge_instance
-
-        # Return all mocks
-        return {
-            "openai": mock_openai_instance,
-            "anthropic": mock_anthropic_instance,
-            "gemini": mock_gemini_instance,
-            "judge": mock_judge_instance,
+def _response(provider, model, text):
+    return {"provider": provider, "model": model, "response": text, "success": True}
+
+
+OPENAI_RESPONSE = _response("OpenAI", OPENAI_DEFAULT_MODEL, "OpenAI response")
+DEFAULT_QUERIES = {
+    "openai": OPENAI_DEFAULT_MODEL,
+    "anthropic": ANTHROPIC_DEFAULT_MODEL,
+    "gemini": GEMINI_DEFAULT_MODEL,
+}
+CUSTOM_QUERIES = {"openai": "gpt-4-turbo", "anthropic": "claude-3-opus-20240229"}
+CUSTOM_ANTHROPIC_RESPONSE = _response(
+    "Anthropic", "claude-3-opus-20240229", "Anthropic response"
+)
+
+COMPARE_SCENARIOS = [
+    pytest.param(
+        {
+            "configs": None,
+            "queried": DEFAULT_QUERIES,
+            "responses": {
+                "openai": OPENAI_RESPONSE,
+                "anthropic": _response(
+                    "Anthropic", ANTHROPIC_DEFAULT_MODEL, "Anthropic response"
+                ),
+                "gemini": _response(
+                    "Google Gemini", GEMINI_DEFAULT_MODEL, "Gemini response"
+                ),
+            },
+            "judge_result": {
+                "result": "OpenAI response",
+                "best_response": OPENAI_RESPONSE,
+                "method": "select",
+                "success": True,
+            },
+            "expected": {
+                "result": "OpenAI response",
+                "best_response": OPENAI_RESPONSE,
+                "success": True,
+            },
+        },
+        id="default",
+    ),
+    pytest.param(
+        {
+            "configs": CUSTOM_QUERIES,
+            "queried": CUSTOM_QUERIES,
+            "responses": {
+                "openai": _response("OpenAI", "gpt-4-turbo", "OpenAI response"),
+                "anthropic": CUSTOM_ANTHROPIC_RESPONSE,
+            },
+            "judge_result": {
+                "result": "Anthropic response",
+                "best_response": CUSTOM_ANTHROPIC_RESPONSE,
+                "method": "select",
+                "success": True,
+            },
+            "expected": {
+                "result": "Anthropic response",
+                "best_response": CUSTOM_ANTHROPIC_RESPONSE,
+                "success": True,
+            },
+        },
+        id="custom",
+    ),
+    pytest.param(
+        {
+            "configs": None,
+            "queried": DEFAULT_QUERIES,
+            "responses": {
+                "openai": Exception("OpenAI API error"),
+                "anthropic": Exception("Anthropic API error"),
+                "gemini": Exception("Gemini API error"),
+            },
+            "judge_result": None,
+            "expected": {
+                "result": "All models failed to respond. Please try again.",
+                "success": False,
+            },
+        },
+        id="all_failed",
+    ),
+    pytest.param(
+        {
+            "configs": None,
+            "queried": DEFAULT_QUERIES,
+            "responses": {
+                "openai": OPENAI_RESPONSE,
+                "anthropic": Exception("Anthropic API error"),
+                "gemini": Exception("Gemini API error"),
+            },
+            "judge_result": {
+                "result": "OpenAI response",
+                "best_response": OPENAI_RESPONSE,
+                "method": "single",
+                "reason": "Only one successful response available",
+                "success": True,
+            },
+            "expected": {
+                "result": "OpenAI response",
+                "method": "single",
+                "success": True,
+            },
+        },
+        id="some_failed",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def model_patches():
+    """Patch the model and judge classes once for the whole module."""
+    targets = {
+        "openai": "multi_ai.models.openai_model.OpenAIModel",
+        "anthropic": "multi_ai.models.anthropic_model.AnthropicModel",
+        "gemini": "multi_ai.models.gemini_model.GeminiModel",
+        "judge": "multi_ai.services.comparator.Judge",
+    }
+    with ExitStack() as stack:
+        yield {
+            name: stack.enter_context(patch(target)) for name, target in targets.items()
         }
 
 
 @pytest.fixture
-def comparator():
-    with patch("multi_ai.models.openai_model.OpenAIModel") as mock_openai, patch(
-        "multi_ai.models.anthropic_model.AnthropicModel"
-    ) as mock_anthropic, patch(
-        "multi_ai.models.gemini_model.GeminiModel"
-    ) as mock_gemini, patch(
-        "multi_ai.services.judge.Judge"
-    ) as mock_judge:
-        return Comparator(use_blending=False)
+def mock_models(model_patches):
+    # Make sure the shared registry is rebuilt from the mocked classes
+    get_model.cache_clear()
+    provider_limits.cache_clear()
 
+    # Setup model instances; the spec makes async methods AsyncMocks
+    # and turns typos in attribute names into errors
+    instances = {
+        "openai": MagicMock(spec=OpenAIModel),
+        "anthropic": MagicMock(spec=AnthropicModel),
+        "gemini": MagicMock(spec=GeminiModel),
+        "judge": MagicMock(spec=Judge),
+    }
+    instances["judge"].stream = False
+    instances["judge"].blend_responses = False
+
+    # Configure mock returns
+    for name, instance in instances.items():
+        model_patches[name].reset_mock()
+        model_patches[name].return_value = instance
+
+    yield instances
+
+    # Don't leak mocked models into other tests
+    get_model.cache_clear()
 
-class TestComparator:
 
+@pytest.fixture
+def comparator(mock_models):
+    return Comparator(use_blending=False)
+
+
+class TestComparator:
     def test_initialization(self, mock_models):
         """Test that the Comparator initializes correctly."""
         with patch("multi_ai.services.comparator.Judge") as mock_judge:
             # Create a new instance with the mock we can directly observe
             comparator = Comparator(use_blending=True)
 
-            # Check models are set up
-            assert "openai" in comparator.models
-            assert "anthropic" in comparator.models
-            assert "gemini" in comparator.models
+            # Check models are loaded lazily from the registry
+            assert comparator.models == {}
+            assert comparator._get_model("openai") is mock_models["openai"]
+            assert comparator._get_model("anthropic") is mock_models["anthropic"]
+            assert comparator._get_model("gemini") is mock_models["gemini"]
 
             # Check judge is initialized with blending
             mock_judge.assert_called_once_with(blend_responses=True)
 
-    @pytest.mark.asyncio
+    def test_models_shared_between_instances(self, mock_models):
+        """Test that comparators reuse the same model clients."""
+        first = Comparator()
+        second = Comparator(use_blending=True)
+
+        assert first._get_model("openai") is second._get_model("openai")
+        assert first.models is not second.models
+
     async def test_query_with_fallback_success(self, comparator):
         """Test successful query with fallback."""
         # Create a direct mock for the model's query method
@@ -91,7 +220,6 @@ class TestComparator:
         assert result["response"] == "Test response from OpenAI"
         assert result["success"] is True
 
-    @pytest.mark.asyncio
     async def test_query_with_fallback_error(self, comparator):
         """Test query with fallback handling an error."""
         # Create a direct mock for the model's query method
@@ -109,185 +237,413 @@ class TestComparator:
         assert "Query failed: API error" in result["error"]
         assert result["success"] is False
 
-    @pytest.mark.asyncio
-    async def test_compare_default_models(self, comparator):
-        """Test compare using default models."""
-        # Setup responses
-        openai_response = {
-            "provider": "OpenAI",
-            "model": OPENAI_DEFAULT_MODEL,
-            "response": "OpenAI response",
+    async def test_query_with_fallback_respects_inflight_limit(self, comparator):
+        """Test that concurrent queries to one provider are bounded."""
+        in_flight = 0
+        peak = 0
+
+        async def slow_query(prompt, model):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {
+                "provider": "OpenAI",
+                "model": model,
+                "response": "ok",
+                "success": True,
+            }
+
+        model_mock = AsyncMock()
+        model_mock.query.side_effect = slow_query
+        comparator.models["openai"] = model_mock
+
+        with patch(
+            "multi_ai.services.comparator.provider_limits",
+            return_value=(asyncio.Semaphore(2), TokenBucket(0)),
+        ):
+            await asyncio.gather(
+                *[
+                    comparator._query_with_fallback("openai", "gpt-4", "Test prompt")
+                    for _ in range(6)
+                ]
+            )
+
+        assert model_mock.query.call_count == 6
+        assert peak == 2
+
+    @pytest.mark.parametrize("scenario", COMPARE_SCENARIOS)
+    async def test_compare(self, comparator, mock_models, scenario):
+        """Test compare across model selections and provider failures."""
+        for provider, response in scenario["responses"].items():
+            if isinstance(response, Exception):
+                mock_models[provider].query.side_effect = response
+            else:
+                mock_models[provider].query.return_value = response
+        mock_models["judge"].evaluate.return_value = scenario["judge_result"]
+
+        result = await comparator.compare("Test prompt", scenario["configs"])
+
+        # Verify exactly the requested models were queried
+        for provider in ("openai", "anthropic", "gemini"):
+            model = scenario["queried"].get(provider)
+            if model is None:
+                mock_models[provider].query.assert_not_called()
+            else:
+                mock_models[provider].query.assert_called_once_with(
+                    "Test prompt", model
+                )
+
+        # The judge only runs when at least one model responded
+        assert mock_models["judge"].evaluate.call_count == int(
+            scenario["judge_result"] is not None
+        )
+        for key, value in scenario["expected"].items():
+            assert result[key] == value
+
+    async def test_compare_uses_cache(self, comparator, mock_models):
+        """Test that a repeated request is served from the cache."""
+        for name in ["openai", "anthropic", "gemini"]:
+            mock_models[name].query.return_value = _response(
+                name, f"{name}-model", f"{name} response"
+            )
+        mock_models["judge"].evaluate.return_value = {
+            "result": "openai response",
+            "method": "select",
             "success": True,
         }
-        anthropic_response = {
-            "provider": "Anthropic",
-            "model": ANTHROPIC_DEFAULT_MODEL,
-            "response": "Anthropic response",
+
+        first = await comparator.compare("Test prompt")
+        second = await comparator.compare("Test prompt")
+
+        # The second call should not reach the models or the judge
+        assert first == second
+        mock_models["openai"].query.assert_called_once()
+        mock_models["judge"].evaluate.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "judge_result",
+        [
+            pytest.param(
+                {
+                    "result": "openai response",
+                    "method": "fallback",
+                    "reason": "Judge failed: timeout",
+                    "success": True,
+                },
+                id="fallback",
+            ),
+            pytest.param(
+                {
+                    "result": "openai response",
+                    "method": "fallback",
+                    "reason": "Blending failed",
+                    "success": True,
+                },
+                id="blend_failed",
+            ),
+            pytest.param(
+                {"result": "openai response", "success": True}, id="unlabelled"
+            ),
+        ],
+    )
+    async def test_compare_skips_cache_for_judge_fallback(
+        self, comparator, mock_models, judge_result
+    ):
+        """Test that a result the judge didn't fully produce is not cached."""
+        for name in ["openai", "anthropic", "gemini"]:
+            mock_models[name].query.return_value = _response(
+                name, f"{name}-model", f"{name} response"
+            )
+        mock_models["judge"].evaluate.return_value = judge_result
+
+        await comparator.compare("Test prompt")
+        await comparator.compare("Test prompt")
+
+        assert mock_models["judge"].evaluate.call_count == 2
+
+    async def test_compare_skips_cache_for_partial_results(
+        self, comparator, mock_models
+    ):
+        """Test that a result judged without a failed provider is not cached."""
+        mock_models["openai"].query.return_value = OPENAI_RESPONSE
+        mock_models["anthropic"].query.side_effect = Exception("Anthropic API error")
+        mock_models["gemini"].query.side_effect = Exception("Gemini API error")
+        mock_models["judge"].evaluate.return_value = {
+            "result": "OpenAI response",
+            "best_response": OPENAI_RESPONSE,
+            "method": "single",
             "success": True,
         }
-        gemini_response = {
-            "provider": "Google Gemini",
-            "model": GEMINI_DEFAULT_MODEL,
-            "response": "Gemini response",
+
+        await comparator.compare("Test prompt")
+        await comparator.compare("Test prompt")
+
+        assert mock_models["openai"].query.call_count == 2
+        assert mock_models["judge"].evaluate.call_count == 2
+
+    async def test_compare_iter_events(self, comparator, mock_models):
+        """Test that compare_iter reports each provider before the final result."""
+        for name in ["openai", "anthropic", "gemini"]:
+            mock_models[name].query.return_value = {
+                "provider": name,
+                "model": f"{name}-model",
+                "response": f"{name} response",
+                "success": True,
+            }
+        mock_models["judge"].evaluate.return_value = {
+            "result": "openai response",
+            "method": "select",
             "success": True,
         }
 
-        # Create direct mocks for the models
-        openai_mock = AsyncMock()
-        anthropic_mock = AsyncMock()
-        gemini_mock = AsyncMock()
-        judge_mock = AsyncMock()
-
-        openai_mock.query.return_value = openai_response
-        anthropic_mock.query.return_value = anthropic_response
-        gemini_mock.query.return_value = gemini_response
-
-        # Replace the models in the comparator
-        comparator.models["openai"] = openai_mock
-        comparator.models["anthropic"] = anthropic_mock
-        comparator.models["gemini"] = gemini_mock
-        comparator.judge = judge_mock
+        events = [event async for event in comparator.compare_iter("Test prompt")]
 
-        # Setup judge response
-        judge_mock.evaluate.return_value = {
+        kinds = [event["event"] for event in events]
+        assert kinds == ["provider_done"] * 3 + ["judging", "result"]
+        assert {event["provider"] for event in events[:3]} == {
+            "openai",
+            "anthropic",
+            "gemini",
+        }
+        assert events[-1]["data"]["result"] == "openai response"
+
+        # The judge receives responses in the requested provider order
+        judged = mock_models["judge"].evaluate.call_args[0][1]
+        assert [r["provider"] for r in judged] == ["openai", "anthropic", "gemini"]
+
+    async def test_compare_iter_streams_blend_chunks(self, comparator, mock_models):
+        """Test that blended text chunks are forwarded before the result."""
+        for name in ["openai", "anthropic", "gemini"]:
+            mock_models[name].query.return_value = {
+                "provider": name,
+                "model": f"{name}-model",
+                "response": f"{name} response",
+                "success": True,
+            }
+        mock_models["judge"].stream = True
+        mock_models["judge"].blend_responses = True
+
+        async def streaming_evaluate(prompt, responses, on_token=None):
+            on_token("Blended ")
+            await asyncio.sleep(0)
+            on_token("text")
+            return {"result": "Blended text", "method": "blend", "success": True}
+
+        mock_models["judge"].evaluate.side_effect = streaming_evaluate
+
+        events = [event async for event in comparator.compare_iter("Test prompt")]
+
+        chunks = [event["text"] for event in events if event["event"] == "blend_chunk"]
+        assert chunks == ["Blended ", "text"]
+        assert events[-1]["event"] == "result"
+        assert events[-1]["data"]["result"] == "Blended text"
+
+    async def test_compare_coalesces_concurrent_requests(self, comparator, mock_models):
+        """Test that identical concurrent requests share a single fan-out."""
+
+        async def slow_query(prompt, model):
+            await asyncio.sleep(0.01)
+            return {
+                "provider": "OpenAI",
+                "model": model,
+                "response": "OpenAI response",
+                "success": True,
+            }
+
+        mock_models["openai"].query.side_effect = slow_query
+        mock_models["judge"].evaluate.return_value = {
             "result": "OpenAI response",
-            "best_response": openai_response,
-            "method": "select",
-            "success": True,
+            "method": "single",
+            "success": False,  # Not cached, so only coalescing can dedupe
         }
 
-        # Call compare
-        result = await comparator.compare("Test prompt")
-
-        # Verify models were queried with default models
-        openai_mock.query.assert_called_once_with("Test prompt", OPENAI_DEFAULT_MODEL)
-        anthropic_mock.query.assert_called_once_with(
-            "Test prompt", ANTHROPIC_DEFAULT_MODEL
+        results = await asyncio.gather(
+            comparator.compare("Test prompt", {"openai": "gpt-4"}),
+            comparator.compare("Test prompt", {"openai": "gpt-4"}),
         )
-        gemini_mock.query.assert_called_once_with("Test prompt", GEMINI_DEFAULT_MODEL)
-
-        # Verify judge was called with all responses
-        judge_mock.evaluate.assert_called_once()
-
-        # Check result
-        assert result["result"] == "OpenAI response"
-        assert result["best_response"] == openai_response
-        assert result["success"] is True
 
-    @pytest.mark.asyncio
-    async def test_compare_custom_models(self, comparator):
-        """Test compare with custom model configurations."""
-        # Setup model configs
-        model_configs = {"openai": "gpt-4-turbo", "anthropic": "claude-3-opus-20240229"}
-
-        # Setup responses
-        openai_response = {
-            "provider": "OpenAI",
-            "model": "gpt-4-turbo",
-            "response": "OpenAI response",
-            "success": True,
-        }
-        anthropic_response = {
-            "provider": "Anthropic",
-            "model": "claude-3-opus-20240229",
-            "response": "Anthropic response",
+        assert results[0] == results[1]
+        mock_models["openai"].query.assert_called_once()
+        mock_models["judge"].evaluate.assert_called_once()
+        assert comparator._inflight == {}
+
+    async def test_compare_coalesced_survives_cancelled_caller(
+        self, comparator, mock_models
+    ):
+        """Test that cancelling the first caller doesn't cancel the shared work."""
+
+        async def slow_query(prompt, model):
+            await asyncio.sleep(0.01)
+            return {
+                "provider": "OpenAI",
+                "model": model,
+                "response": "OpenAI response",
+                "success": True,
+            }
+
+        mock_models["openai"].query.side_effect = slow_query
+        mock_models["judge"].evaluate.return_value = {
+            "result": "OpenAI response",
+            "method": "single",
             "success": True,
         }
 
-        # Create direct mocks for the models
-        openai_mock = AsyncMock()
-        anthropic_mock = AsyncMock()
-        judge_mock = AsyncMock()
-
-        openai_mock.query.return_value = openai_response
-        anthropic_mock.query.return_value = anthropic_response
+        first = asyncio.create_task(
+            comparator.compare("Test prompt", {"openai": "gpt-4"})
+        )
+        second = asyncio.create_task(
+            comparator.compare("Test prompt", {"openai": "gpt-4"})
+        )
+        await asyncio.sleep(0)
+        first.cancel()
 
-        # Replace the models in the comparator
-        comparator.models["openai"] = openai_mock
-        comparator.models["anthropic"] = anthropic_mock
-        comparator.judge = judge_mock
+        result = await second
 
-        # Setup judge response
-        judge_mock.evaluate.return_value = {
-            "result": "Anthropic response",
-            "best_response": anthropic_response,
+        assert first.cancelled()
+        assert result["result"] == "OpenAI response"
+        mock_models["openai"].query.assert_called_once()
+        assert comparator._inflight == {}
+
+    async def test_compare_iter_drops_stragglers(self, comparator, mock_models):
+        """Test that a slow provider is dropped once enough others have succeeded."""
+
+        def respond(name):
+            return {
+                "provider": name,
+                "model": f"{name}-model",
+                "response": f"{name} response",
+                "success": True,
+            }
+
+        async def never_finishes(prompt, model):
+            await asyncio.sleep(10)
+
+        mock_models["openai"].query.return_value = respond("openai")
+        mock_models["anthropic"].query.return_value = respond("anthropic")
+        mock_models["gemini"].query.side_effect = never_finishes
+        mock_models["judge"].evaluate.return_value = {
+            "result": "openai response",
             "method": "select",
             "success": True,
         }
+        comparator.straggler_timeout = 0.01
 
-        # Call compare
-        result = await comparator.compare("Test prompt", model_configs)
+        events = [event async for event in comparator.compare_iter("Test prompt")]
 
-        # Verify only specified models were queried
-        openai_mock.query.assert_called_once_with("Test prompt", "gpt-4-turbo")
-        anthropic_mock.query.assert_called_once_with(
-            "Test prompt", "claude-3-opus-20240229"
-        )
+        assert {"event": "provider_timeout", "provider": "gemini"} in events
+        assert events[-1]["data"]["result"] == "openai response"
 
-        # Check result
-        assert result["result"] == "Anthropic response"
-        assert result["best_response"] == anthropic_response
-        assert result["success"] is True
+        # Only the responses that arrived in time are judged
+        judged = mock_models["judge"].evaluate.call_args[0][1]
+        assert [r["provider"] for r in judged] == ["openai", "anthropic"]
 
-    @pytest.mark.asyncio
-    async def test_compare_all_responses_failed(self, comparator, mock_models):
-        """Test compare when all responses fail."""
-        # Make all model calls fail
-        mock_models["openai"].query.side_effect = Exception("OpenAI API error")
-        mock_models["anthropic"].query.side_effect = Exception("Anthropic API error")
-        mock_models["gemini"].query.side_effect = Exception("Gemini API error")
-
-        # Call compare
-        result = await comparator.compare("Test prompt")
+        # A verdict missing a dropped provider isn't cached
+        assert (
+            comparator.cache.get(make_cache_key("Test prompt", DEFAULT_QUERIES, False))
+            is None
+        )
 
-        # Verify result
-        assert result["success"] is False
-        assert "All models failed to respond" in result["result"]
-        assert mock_models["judge"].evaluate.call_count == 0
-
-    @pytest.mark.asyncio
-    async def test_compare_some_responses_failed(self, comparator):
-        """Test compare when some responses fail but others succeed."""
-        # Setup responses
-        openai_response = {
-            "provider": "OpenAI",
-            "model": OPENAI_DEFAULT_MODEL,
-            "response": "OpenAI response",
+    async def test_compare_iter_waits_for_slow_providers_by_default(
+        self, mock_models, monkeypatch
+    ):
+        """Test that no provider is dropped unless a straggler budget is configured."""
+
+        async def slow_query(prompt, model):
+            await asyncio.sleep(0.05)
+            return _response("gemini", model, "gemini response")
+
+        monkeypatch.delenv("STRAGGLER_MS", raising=False)
+        monkeypatch.delenv("SPECULATIVE_JUDGE", raising=False)
+        comparator = Comparator()
+        mock_models["openai"].query.return_value = OPENAI_RESPONSE
+        mock_models["anthropic"].query.return_value = CUSTOM_ANTHROPIC_RESPONSE
+        mock_models["gemini"].query.side_effect = slow_query
+        mock_models["judge"].evaluate.return_value = {
+            "result": "OpenAI response",
+            "method": "select",
             "success": True,
         }
 
-        # Create direct mocks for the models
-        openai_mock = AsyncMock()
-        anthropic_mock = AsyncMock()
-        gemini_mock = AsyncMock()
-        judge_mock = AsyncMock()
-
-        openai_mock.query.return_value = openai_response
-        anthropic_mock.query.side_effect = Exception("Anthropic API error")
-        gemini_mock.query.side_effect = Exception("Gemini API error")
-
-        # Replace the models in the comparator
-        comparator.models["openai"] = openai_mock
-        comparator.models["anthropic"] = anthropic_mock
-        comparator.models["gemini"] = gemini_mock
-        comparator.judge = judge_mock
-
-        # Setup judge response
-        judge_mock.evaluate.return_value = {
-            "result": "OpenAI response",
-            "best_response": openai_response,
-            "method": "single",
-            "reason": "Only one successful response available",
+        events = [event async for event in comparator.compare_iter("Test prompt")]
+
+        assert comparator.straggler_timeout == 0
+        assert "provider_timeout" not in [e["event"] for e in events]
+        judged = mock_models["judge"].evaluate.call_args[0][1]
+        assert len(judged) == 3
+
+    async def test_compare_iter_speculative_judge_wins(self, comparator, mock_models):
+        """Test that a judge finishing before the last provider ends the comparison."""
+
+        def respond(name):
+            return {
+                "provider": name,
+                "model": f"{name}-model",
+                "response": f"{name} response",
+                "success": True,
+            }
+
+        async def slow_query(prompt, model):
+            await asyncio.sleep(1)
+            return respond("gemini")
+
+        mock_models["openai"].query.return_value = respond("openai")
+        mock_models["anthropic"].query.return_value = respond("anthropic")
+        mock_models["gemini"].query.side_effect = slow_query
+        mock_models["judge"].evaluate.return_value = {
+            "result": "openai response",
+            "method": "select",
             "success": True,
         }
+        comparator.speculative_judge = True
+        comparator.straggler_timeout = 0
 
-        # Call compare
-        result = await comparator.compare("Test prompt")
+        events = [event async for event in comparator.compare_iter("Test prompt")]
 
-        # Verify judge was called with only successful responses
-        judge_mock.evaluate.assert_called_once()
+        assert {"event": "provider_timeout", "provider": "gemini"} in events
+        assert events[-1]["data"]["result"] == "openai response"
+        mock_models["judge"].evaluate.assert_called_once()
 
-        # Check result
-        assert result["success"] is True
-        assert result["result"] == "OpenAI response"
-        assert result["method"] == "single"
+        # The speculative verdict skipped gemini, so it isn't cached
+        assert (
+            comparator.cache.get(make_cache_key("Test prompt", DEFAULT_QUERIES, False))
+            is None
+        )
+
+    async def test_compare_iter_speculative_judge_restarts(
+        self, comparator, mock_models
+    ):
+        """Test that a late response restarts a judge that hasn't finished."""
+
+        def respond(name):
+            return {
+                "provider": name,
+                "model": f"{name}-model",
+                "response": f"{name} response",
+                "success": True,
+            }
+
+        async def late_query(prompt, model):
+            await asyncio.sleep(0.01)
+            return respond("gemini")
+
+        async def slow_evaluate(prompt, responses):
+            await asyncio.sleep(0.05)
+            return {"result": "blended", "method": "select", "success": True}
+
+        mock_models["openai"].query.return_value = respond("openai")
+        mock_models["anthropic"].query.return_value = respond("anthropic")
+        mock_models["gemini"].query.side_effect = late_query
+        mock_models["judge"].evaluate.side_effect = slow_evaluate
+        comparator.speculative_judge = True
+        comparator.straggler_timeout = 0
+
+        events = [event async for event in comparator.compare_iter("Test prompt")]
+
+        assert [e["event"] for e in events].count("judging") == 2
+        assert events[-1]["data"]["result"] == "blended"
+
+        # The final evaluation saw every response
+        judged = mock_models["judge"].evaluate.call_args[0][1]
+        assert [r["provider"] for r in judged] == ["openai", "anthropic", "gemini"]
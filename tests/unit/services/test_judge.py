@@ -1,17 +1,119 @@
 import pytest
 import json
-from unittest.mock import patch, AsyncMock, MagicMock, ANY
-import os
-from multi_ai.services.judge import Judge
-from multi_ai.config import JUDGE_DEFAULT_PROVIDER, JUDGE_DEFAULT_MODEL
+import asyncio
+from unittest.mock import patch
+import inspect
+import random
+from collections.abc import Iterator
+from types import MappingProxyType, SimpleNamespace
+from multi_ai.services.judge import (
+    Judge,
+    JudgeBatcher,
+    _judge_batcher,
+    close_judge_batcher,
+)
+from multi_ai.models.registry import get_model
+from multi_ai.utils.rate_limit import TokenBucket
+
+
+DEFAULT_SELECT_EXPLANATION = "Selected based on overall quality assessment."
+DEFAULT_WEIGHT_EXPLANATION = (
+    "Weights assigned based on quality assessment across multiple criteria."
+)
+BLEND_EXPLANATION = (
+    "OpenAI provided the most accurate information, Anthropic had good "
+    "structure, and Gemini had unique insights"
+)
+
+PROMPT_SNIPPETS = (
+    "Original prompt: Test prompt",
+    "Model responses:",
+    "Response 1: OpenAI (gpt-4)",
+    "Response 2: Anthropic (claude-3-opus)",
+    "Response 3: Google Gemini (gemini-pro)",
+    "Provide a brief explanation",
+)
+SELECT_PROMPT_SNIPPETS = PROMPT_SNIPPETS + (
+    "Identify the number of the best response",
+    '{"explanation": "Your explanation here", "selection": N}',
+)
+BLEND_PROMPT_SNIPPETS = PROMPT_SNIPPETS + (
+    "Assign a weight between 0 and 10",
+    '{"explanation": "Your explanation here", "weights": [X, Y, Z]}',
+)
+
+
+class AsyncStub:
+    """Async callable that records its calls; a lightweight AsyncMock stand-in."""
+
+    def __init__(self):
+        self.return_value = None
+        self.side_effect = None
+        self.calls = []
+
+    async def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        effect = self.side_effect
+        if effect is None:
+            return self.return_value
+        if callable(effect):
+            result = effect(*args, **kwargs)
+            return await result if inspect.isawaitable(result) else result
+        if not isinstance(effect, Iterator):
+            effect = self.side_effect = iter(effect)
+        result = next(effect)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+
+class FakeJudgeModel:
+    """Judge model stub exposing the methods the judge awaits."""
+
+    def __init__(self):
+        self.query = AsyncStub()
+        self.embed = AsyncStub()
+
+
+class OrderPreservingRandom(random.Random):
+    """Random whose anonymization shuffle and coin flip keep the input order."""
+
+    def shuffle(self, x):
+        pass
+
+    def random(self):
+        return 0.9
+
+
+@pytest.fixture(scope="module", autouse=True)
+def deterministic_anonymization():
+    """Make every judge built in this module keep response order."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            "multi_ai.services.judge.random",
+            SimpleNamespace(Random=OrderPreservingRandom),
+        )
+        yield
+
+
+@pytest.fixture(scope="module")
+def openai_model_patch():
+    """Patch the OpenAI model class once for the whole module."""
+    with patch("multi_ai.models.openai_model.OpenAIModel") as mock_model:
+        yield mock_model
 
 
 @pytest.fixture
-def mock_openai_model():
-    with patch("multi_ai.services.judge.OpenAIModel") as mock_model:
-        mock_instance = AsyncMock()
-        mock_model.return_value = mock_instance
-        yield mock_instance
+def mock_openai_model(openai_model_patch):
+    # Make sure the shared registry is rebuilt from the mocked class
+    get_model.cache_clear()
+    mock_instance = FakeJudgeModel()
+    openai_model_patch.reset_mock()
+    openai_model_patch.return_value = mock_instance
+    yield mock_instance
+
+    # Don't leak the mocked model into other tests
+    get_model.cache_clear()
 
 
 @pytest.fixture
@@ -19,32 +121,75 @@ def judge(mock_openai_model):
     return Judge(model_provider="openai", model_name="gpt-4-turbo")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def judge_ro(openai_model_patch):
+    """A judge shared by the tests that never change its state or query it."""
+    judge = Judge(model_provider="openai", model_name="gpt-4-turbo")
+    get_model.cache_clear()
+    return judge
+
+
+@pytest.fixture(scope="session")
 def sample_responses():
-    return [
-        {
-            "provider": "OpenAI",
-            "model": "gpt-4",
-            "response": "Response from OpenAI model",
-            "success": True,
-        },
-        {
-            "provider": "Anthropic",
-            "model": "claude-3-opus",
-            "response": "Response from Anthropic model",
-            "success": True,
-        },
-        {
-            "provider": "Google Gemini",
-            "model": "gemini-pro",
-            "response": "Response from Google Gemini model",
-            "success": True,
-        },
-    ]
+    # Shared by every test, so read-only; copy before changing a response
+    return tuple(
+        MappingProxyType(response)
+        for response in (
+            {
+                "provider": "OpenAI",
+                "model": "gpt-4",
+                "response": "Response from OpenAI model",
+                "success": True,
+            },
+            {
+                "provider": "Anthropic",
+                "model": "claude-3-opus",
+                "response": "Response from Anthropic model",
+                "success": True,
+            },
+            {
+                "provider": "Google Gemini",
+                "model": "gemini-pro",
+                "response": "Response from Google Gemini model",
+                "success": True,
+            },
+        )
+    )
 
 
-class TestJudge:
+@pytest.fixture(scope="module")
+def anonymized_sample(judge_ro, sample_responses):
+    """sample_responses anonymized once, with a shuffle that reverses the order."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(judge_ro._rng, "shuffle", lambda x: x.sort(reverse=True))
+        return judge_ro._anonymize_responses(sample_responses)
+
+
+@pytest.fixture(scope="session")
+def blend_mock_calls():
+    """Judge model replies for a weighting call followed by a blending call."""
+    weights = {"weights": [7, 5, 3], "explanation": BLEND_EXPLANATION}
+    return (
+        MappingProxyType(
+            {
+                "provider": "OpenAI",
+                "model": "gpt-4-turbo",
+                "response": json.dumps(weights),
+                "success": True,
+            }
+        ),
+        MappingProxyType(
+            {
+                "provider": "OpenAI",
+                "model": "gpt-4-turbo",
+                "response": "Blended response combining all three models",
+                "success": True,
+            }
+        ),
+    )
+
 
+class TestJudge:
     def test_initialization_custom(self, mock_openai_model):
         """Test initialization with custom values."""
         judge = Judge(
@@ -55,19 +200,22 @@ class TestJudge:
         assert judge.model_name == "gpt-4-turbo"
         assert judge.blend_responses is True
 
-    def test_initialization_env_vars(self, monkeypatch):
+    def test_initialization_env_vars(self, monkeypatch, mock_openai_model):
         """Test initialization from environment variables."""
         monkeypatch.setenv("JUDGE_MODEL_PROVIDER", "openai")
         monkeypatch.setenv("JUDGE_MODEL", "custom-model")
 
-        with patch("multi_ai.services.judge.OpenAIModel") as mock_model:
-            mock_instance = MagicMock()
-            mock_model.return_value = mock_instance
+        judge = Judge()
+
+        assert judge.model_provider == "openai"
+        assert judge.model_name == "custom-model"
 
-            judge = Judge()
+    def test_judges_share_model(self, mock_openai_model):
+        """Test that judges reuse the shared model instead of building their own."""
+        first = Judge(model_provider="openai")
+        second = Judge(model_provider="openai", blend_responses=True)
 
-            assert judge.model_provider == "openai"
-            assert judge.model_name == "custom-model"
+        assert first.model is second.model is mock_openai_model
 
     def test_initialization_unsupported_provider(self):
         """Test initialization with unsupported provider."""
@@ -76,140 +224,137 @@ class TestJudge:
 
         assert "Unsupported judge model provider: unsupported" in str(e.value)
 
-    def test_anonymize_responses(self, judge, sample_responses):
+    def test_anonymize_responses(self, anonymized_sample):
         """Test response anonymization."""
-        with patch("random.shuffle") as mock_shuffle:
-            # Make shuffle predictable for testing
-            mock_shuffle.side_effect = lambda x: x.sort(reverse=True)
-
-            anonymized, provider_map = judge._anonymize_responses(sample_responses)
-
-            # Check anonymized responses
-            assert len(anonymized) == 3
-            assert anonymized[0]["provider"] == "Provider 1"
-            assert anonymized[0]["model"] == "Model 1"
-
-            # Check provider map is correct
-            assert provider_map[0][1] == "Google Gemini"
-            assert provider_map[1][1] == "Anthropic"
-            assert provider_map[2][1] == "OpenAI"
-
-    def test_create_evaluation_prompt_select_mode(self, judge, sample_responses):
-        """Test creating evaluation prompt in selection mode."""
-        prompt = judge._create_evaluation_prompt(
-            "Test prompt", sample_responses, blend_mode=False
-        )
+        anonymized, provider_map = anonymized_sample
 
-        # Check key elements in prompt
-        assert "Original prompt: Test prompt" in prompt
-        assert "Model responses:" in prompt
-        assert "Response 1: OpenAI (gpt-4)" in prompt
-        assert "Response 2: Anthropic (claude-3-opus)" in prompt
-        assert "Response 3: Google Gemini (gemini-pro)" in prompt
-        assert "Provide a brief explanation" in prompt
-        assert "Identify the number of the best response" in prompt
-        assert '{"explanation": "Your explanation here", "selection": N}' in prompt
-
-    def test_create_evaluation_prompt_blend_mode(self, judge, sample_responses):
-        """Test creating evaluation prompt in blending mode."""
-        prompt = judge._create_evaluation_prompt(
-            "Test prompt", sample_responses, blend_mode=True
-        )
+        # Check anonymized responses
+        assert len(anonymized) == 3
+        assert anonymized[0]["provider"] == "Provider 1"
+        assert anonymized[0]["model"] == "Model 1"
 
-        # Check key elements in prompt
-        assert "Original prompt: Test prompt" in prompt
-        assert "Model responses:" in prompt
-        assert "Response 1: OpenAI (gpt-4)" in prompt
-        assert "Response 2: Anthropic (claude-3-opus)" in prompt
-        assert "Response 3: Google Gemini (gemini-pro)" in prompt
-        assert "Provide a brief explanation" in prompt
-        assert "Assign a weight between 0 and 10" in prompt
-        assert (
-            '{"explanation": "Your explanation here", "weights": [X, Y, Z]}' in prompt
-        )
+        # Check provider map is correct
+        assert provider_map[0][1] == "Google Gemini"
+        assert provider_map[1][1] == "Anthropic"
+        assert provider_map[2][1] == "OpenAI"
 
-    def test_parse_selected_index(self, judge):
-        """Test parsing the selected index from judge responses."""
-        # Test direct number
-        index, explanation = judge._parse_selected_index("2")
-        assert index == 1  # Zero-indexed
-        assert (
-            explanation == "Selected based on overall quality assessment."
-        )  # Default explanation
-
-        # Test with surrounding text
-        index, explanation = judge._parse_selected_index("The best response is 3.")
-        assert index == 2  # Zero-indexed
-        assert explanation == "Selected based on overall quality assessment."
-
-        # Test with quotes
-        index, explanation = judge._parse_selected_index("'1'")
-        assert index == 0  # Zero-indexed
-        assert explanation == "Selected based on overall quality assessment."
-
-        # Test with JSON format containing explanation
-        index, explanation = judge._parse_selected_index(
-            '{"selection": 2, "explanation": "Response 2 is more detailed and accurate"}'
+    def test_anonymize_responses_seeded(
+        self, mock_openai_model, sample_responses, monkeypatch
+    ):
+        """Test that a seeded judge shuffles reproducibly, including for two responses."""
+        monkeypatch.setattr("multi_ai.services.judge.random", random)
+        for responses in (sample_responses, sample_responses[:2]):
+            first = Judge(model_provider="openai", seed=7)
+            second = Judge(model_provider="openai", seed=7)
+
+            _, first_map = first._anonymize_responses(responses)
+            _, second_map = second._anonymize_responses(responses)
+
+            assert first_map == second_map
+            assert sorted(idx for idx, _, _ in first_map) == list(range(len(responses)))
+
+    @pytest.mark.parametrize(
+        "blend_mode,snippets",
+        [
+            pytest.param(False, SELECT_PROMPT_SNIPPETS, id="select"),
+            pytest.param(True, BLEND_PROMPT_SNIPPETS, id="blend"),
+        ],
+    )
+    def test_create_evaluation_prompt(
+        self, judge_ro, sample_responses, blend_mode, snippets
+    ):
+        """Test that the evaluation prompt contains every key element for its mode."""
+        prompt = judge_ro._create_evaluation_prompt(
+            "Test prompt", sample_responses, blend_mode=blend_mode
         )
-        assert index == 1  # Zero-indexed
-        assert explanation == "Response 2 is more detailed and accurate"
 
-        # Test invalid input
-        index, explanation = judge._parse_selected_index("None of them are good")
-        assert index is None
-        assert (
-            explanation == "Selected based on overall quality assessment."
-        )  # Default explanation
-
-    def test_parse_weights(self, judge):
+        missing = [snippet for snippet in snippets if snippet not in prompt]
+        assert not missing, missing
+
+    @pytest.mark.parametrize(
+        "text,expected_index,expected_explanation",
+        [
+            pytest.param("2", 1, DEFAULT_SELECT_EXPLANATION, id="number"),
+            pytest.param(
+                "The best response is 3.", 2, DEFAULT_SELECT_EXPLANATION, id="text"
+            ),
+            pytest.param("'1'", 0, DEFAULT_SELECT_EXPLANATION, id="quoted"),
+            pytest.param(
+                '{"selection": 2, "explanation": "Response 2 is more detailed and accurate"}',
+                1,
+                "Response 2 is more detailed and accurate",
+                id="json",
+            ),
+            pytest.param(
+                '{\n  "selection": 3,\n  "explanation": "Clearest answer"\n}',
+                2,
+                "Clearest answer",
+                id="multiline_json",
+            ),
+            pytest.param(
+                "None of them are good", None, DEFAULT_SELECT_EXPLANATION, id="invalid"
+            ),
+        ],
+    )
+    def test_parse_selected_index(
+        self, judge_ro, text, expected_index, expected_explanation
+    ):
+        """Test parsing the zero-based selected index from judge responses."""
+        index, explanation = judge_ro._parse_selected_index(text)
+        assert index == expected_index
+        assert explanation == expected_explanation
+
+    @pytest.mark.parametrize(
+        "text,expected_weights,expected_explanation",
+        [
+            pytest.param(
+                '{"weights": [8, 5, 2]}',
+                [8, 5, 2],
+                DEFAULT_WEIGHT_EXPLANATION,
+                id="json",
+            ),
+            pytest.param(
+                '{"weights": [8, 5, 2], "explanation": "OpenAI response was more accurate and comprehensive"}',
+                [8, 5, 2],
+                "OpenAI response was more accurate and comprehensive",
+                id="json_with_explanation",
+            ),
+            pytest.param(
+                'Here are my weights: {"weights": [9, 4, 7]}',
+                [9, 4, 7],
+                DEFAULT_WEIGHT_EXPLANATION,
+                id="surrounding_text",
+            ),
+            pytest.param(
+                'Result: {"weights": [3, 2, 1], "explanation": "Uses {braces}", "meta": {"k": 1}} {"weights": [1, 1, 1]}',
+                [3, 2, 1],
+                "Uses {braces}",
+                id="nested_braces",
+            ),
+            pytest.param(
+                "7 6 3", [7.0, 6.0, 3.0], DEFAULT_WEIGHT_EXPLANATION, id="plain_numbers"
+            ),
+            # Unparseable input reports no weights
+            pytest.param(
+                "I can't decide",
+                None,
+                DEFAULT_WEIGHT_EXPLANATION,
+                id="invalid",
+            ),
+        ],
+    )
+    def test_parse_weights(
+        self, judge_ro, text, expected_weights, expected_explanation
+    ):
         """Test parsing weights from judge responses."""
-        # Test valid JSON without explanation
-        valid_json = '{"weights": [8, 5, 2]}'
-        weights, explanation = judge._parse_weights(valid_json, 3)
-        assert weights == [8, 5, 2]
-        assert (
-            explanation
-            == "Weights assigned based on quality assessment across multiple criteria."
-        )  # Default explanation
-
-        # Test JSON with explanation
-        json_with_explanation = '{"weights": [8, 5, 2], "explanation": "OpenAI response was more accurate and comprehensive"}'
-        weights, explanation = judge._parse_weights(json_with_explanation, 3)
-        assert weights == [8, 5, 2]
-        assert explanation == "OpenAI response was more accurate and comprehensive"
-
-        # Test JSON with surrounding text
-        text_with_json = 'Here are my weights: {"weights": [9, 4, 7]}'
-        weights, explanation = judge._parse_weights(text_with_json, 3)
-        assert weights == [9, 4, 7]
-        assert (
-            explanation
-            == "Weights assigned based on quality assessment across multiple criteria."
-        )
-
-        # Test plain numbers
-        plain_numbers = "7 6 3"
-        weights, explanation = judge._parse_weights(plain_numbers, 3)
-        assert weights == [7.0, 6.0, 3.0]
-        assert (
-            explanation
-            == "Weights assigned based on quality assessment across multiple criteria."
-        )
-
-        # Test invalid input - fallback to equal weights
-        invalid_input = "I can't decide"
-        expected_equal_weights = [1 / 3, 1 / 3, 1 / 3]
-        weights, explanation = judge._parse_weights(invalid_input, 3)
-        assert len(weights) == 3
-        assert all(
-            abs(w - expected_equal_weights[i]) < 0.01 for i, w in enumerate(weights)
-        )
-        assert (
-            explanation
-            == "Weights assigned based on quality assessment across multiple criteria."
-        )
-
-    @pytest.mark.asyncio
+        weights, explanation = judge_ro._parse_weights(text, 3)
+        if expected_weights is None:
+            assert weights is None
+        else:
+            assert weights == pytest.approx(expected_weights, abs=0.01)
+        assert explanation == expected_explanation
+
+    @pytest.mark.judge_evaluate
     async def test_evaluate_single_response(self, judge, mock_openai_model):
         """Test evaluation with a single response."""
         responses = [
@@ -224,7 +369,7 @@ class TestJudge:
         result = await judge.evaluate("Test prompt", responses)
 
         # Model should not be called for single response
-        mock_openai_model.query.assert_not_called()
+        assert mock_openai_model.query.calls == []
 
         # Check result
         assert result["result"] == "Single response"
@@ -236,7 +381,7 @@ class TestJudge:
             == "Only one successful response was available, so it was selected automatically."
         )
 
-    @pytest.mark.asyncio
+    @pytest.mark.judge_evaluate
     async def test_evaluate_selection_mode(
         self, judge, sample_responses, mock_openai_model
     ):
@@ -249,50 +394,25 @@ class TestJudge:
         3. Parse the response to select the best response
         4. Return the selected response with appropriate metadata
 
-        Since the anonymization process includes randomization, this test mocks
-        the anonymization process to make it deterministic for testing.
+        Anonymization keeps the input order here thanks to the module's
+        deterministic_anonymization fixture.
         """
+        # Setup judge to always select the OpenAI response (index 0) with explanation
+        mock_openai_model.query.return_value = {
+            "provider": "OpenAI",
+            "model": "gpt-4-turbo",
+            "response": '{"selection": 1, "explanation": "Response 1 is more accurate and detailed"}',  # Select first response with explanation
+            "success": True,
+        }
 
-        # Mock _anonymize_responses to get predictable results
-        original_anonymize = judge._anonymize_responses
-
-        # Create a fake anonymization that preserves order
-        def fake_anonymize(responses):
-            anonymized = []
-            provider_map = {}
-
-            for i, resp in enumerate(responses):
-                anonymized.append(
-                    {
-                        "provider": f"Provider {i+1}",
-                        "model": f"Model {i+1}",
-                        "response": resp["response"],
-                        "success": resp["success"],
-                    }
-                )
-                provider_map[i] = (i, resp["provider"], resp["model"])
-
-            return anonymized, provider_map
-
-        # Patch the method and execute within the context
-        with patch.object(judge, "_anonymize_responses", side_effect=fake_anonymize):
-            # Setup judge to always select the OpenAI response (index 0) with explanation
-            mock_openai_model.query.return_value = {
-                "provider": "OpenAI",
-                "model": "gpt-4-turbo",
-                "response": '{"selection": 1, "explanation": "Response 1 is more accurate and detailed"}',  # Select first response with explanation
-                "success": True,
-            }
-
-            # Execute the evaluate method within the patch context
-            result = await judge.evaluate("Test prompt", sample_responses)
+        result = await judge.evaluate("Test prompt", sample_responses)
 
         # Check judge was called
-        mock_openai_model.query.assert_called_once()
+        assert len(mock_openai_model.query.calls) == 1
         assert (
-            mock_openai_model.query.call_args[0][0] is not None
+            mock_openai_model.query.calls[-1][0][0] is not None
         )  # Should have a prompt
-        assert mock_openai_model.query.call_args[1]["model"] == "gpt-4-turbo"
+        assert mock_openai_model.query.calls[-1][1]["model"] == "gpt-4-turbo"
 
         # Check result
         assert result["result"] == "Response from OpenAI model"
@@ -302,7 +422,7 @@ class TestJudge:
         assert "explanation" in result
         assert result["explanation"] == "Response 1 is more accurate and detailed"
 
-    @pytest.mark.asyncio
+    @pytest.mark.judge_evaluate
     async def test_evaluate_selection_judge_failed(
         self, judge, sample_responses, mock_openai_model
     ):
@@ -328,53 +448,548 @@ class TestJudge:
             == "The judge model encountered an error. Defaulting to the first available response."
         )
 
-    @pytest.mark.asyncio
+    @pytest.mark.judge_evaluate
     async def test_evaluate_blend_mode(
-        self, judge, sample_responses, mock_openai_model
+        self, judge, sample_responses, mock_openai_model, blend_mock_calls
     ):
         """Test evaluation in blend mode."""
         # Switch to blend mode
         judge.blend_responses = True
 
-        # Setup judge response with weights and explanation
+        # First call returns the weights, second the blended text
+        mock_openai_model.query.side_effect = blend_mock_calls
+
+        result = await judge.evaluate("Test prompt", sample_responses)
+
+        # Check judge was called twice
+        assert len(mock_openai_model.query.calls) == 2
+
+        # Check result
+        assert result["result"] == "Blended response combining all three models"
+        assert "weights" in result
+        assert len(result["weights"]) == 3
+        assert result["method"] == "blend"
+        assert result["success"] is True
+        assert "explanation" in result
+        assert result["explanation"] == BLEND_EXPLANATION
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_reuses_cached_verdict(
+        self, judge, sample_responses, mock_openai_model
+    ):
+        """Test that a repeated prompt/response set skips the judge model."""
         mock_openai_model.query.return_value = {
             "provider": "OpenAI",
             "model": "gpt-4-turbo",
-            "response": '{"weights": [7, 5, 3], "explanation": "OpenAI provided the most accurate information, Anthropic had good structure, and Gemini had unique insights"}',
+            "response": '{"selection": 2, "explanation": "Response 2 is best"}',
             "success": True,
         }
 
-        # Setup blend response
+        first = await judge.evaluate("Test prompt", sample_responses)
+        # Same responses from providers arriving in a different order
+        second = await judge.evaluate("Test prompt", sample_responses[::-1])
+
+        assert len(mock_openai_model.query.calls) == 1
+        assert first["best_response"]["provider"] == "Anthropic"
+        assert second["best_response"]["provider"] == "Anthropic"
+        assert second["result"] == first["result"]
+        assert second["explanation"] == "Response 2 is best"
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_does_not_cache_fallback(
+        self, judge, sample_responses, mock_openai_model
+    ):
+        """Test that verdicts are not cached when the judge fails."""
+        mock_openai_model.query.return_value = {
+            "provider": "OpenAI",
+            "model": "gpt-4-turbo",
+            "error": "Judge API error",
+            "success": False,
+        }
+
+        await judge.evaluate("Test prompt", sample_responses)
+        await judge.evaluate("Test prompt", sample_responses)
+
+        assert len(mock_openai_model.query.calls) == 2
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_semantic_cache_hit(
+        self, judge, sample_responses, mock_openai_model
+    ):
+        """Test that a paraphrased prompt reuses the verdict for the same responses."""
+        judge.semantic_threshold = 0.95
+        mock_openai_model.embed.side_effect = [[1.0, 0.0], [0.99, 0.05]]
+        mock_openai_model.query.return_value = {
+            "provider": "OpenAI",
+            "model": "gpt-4-turbo",
+            "response": '{"selection": 1, "explanation": "Response 1 is best"}',
+            "success": True,
+        }
+
+        first = await judge.evaluate("Summarize X", sample_responses)
+        second = await judge.evaluate("Give me a summary of X", sample_responses)
+
+        assert len(mock_openai_model.query.calls) == 1
+        assert second["best_response"] == first["best_response"]
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_semantic_cache_requires_same_responses(
+        self, judge, sample_responses, mock_openai_model
+    ):
+        """Test that similar prompts with different responses still call the judge."""
+        judge.semantic_threshold = 0.95
+        mock_openai_model.embed.return_value = [1.0, 0.0]
+        mock_openai_model.query.return_value = {
+            "provider": "OpenAI",
+            "model": "gpt-4-turbo",
+            "response": '{"selection": 1, "explanation": "Response 1 is best"}',
+            "success": True,
+        }
+
+        await judge.evaluate("Summarize X", sample_responses)
+        await judge.evaluate("Summarize X again", sample_responses[:2])
+
+        assert len(mock_openai_model.query.calls) == 2
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_multiple_samples_majority_vote(
+        self, sample_responses, mock_openai_model
+    ):
+        """Test that multiple judge samples are queried and the modal selection wins."""
+        judge = Judge(model_provider="openai", num_judge_samples=3)
         mock_openai_model.query.side_effect = [
-            # First call for weights
+            {"response": '{"selection": 2, "explanation": "Two"}', "success": True},
+            {"response": '{"selection": 1, "explanation": "One"}', "success": True},
             {
-                "provider": "OpenAI",
-                "model": "gpt-4-turbo",
-                "response": '{"weights": [7, 5, 3], "explanation": "OpenAI provided the most accurate information, Anthropic had good structure, and Gemini had unique insights"}',
-                "success": True,
-            },
-            # Second call for blending
-            {
-                "provider": "OpenAI",
-                "model": "gpt-4-turbo",
-                "response": "Blended response combining all three models",
+                "response": '{"selection": 2, "explanation": "Two again"}',
                 "success": True,
             },
         ]
 
         result = await judge.evaluate("Test prompt", sample_responses)
 
-        # Check judge was called twice
-        assert mock_openai_model.query.call_count == 2
+        assert len(mock_openai_model.query.calls) == 3
+        assert result["best_response"]["provider"] == "Anthropic"
+        assert result["explanation"] == "Two"
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_multiple_samples_average_weights(
+        self, sample_responses, mock_openai_model
+    ):
+        """Test that blend weights are averaged across samples, ignoring failures."""
+        judge = Judge(
+            model_provider="openai", blend_responses=True, num_judge_samples=3
+        )
+        mock_openai_model.query.side_effect = [
+            {"response": '{"weights": [1, 0, 0]}', "success": True},
+            {"error": "Judge API error", "success": False},
+            {"response": '{"weights": [0, 1, 0]}', "success": True},
+            # Blending call
+            {"response": "Blended", "success": True},
+        ]
+
+        result = await judge.evaluate("Test prompt", sample_responses)
 
-        # Check result
-        assert result["result"] == "Blended response combining all three models"
-        assert "weights" in result
-        assert len(result["weights"]) == 3
         assert result["method"] == "blend"
-        assert result["success"] is True
-        assert "explanation" in result
-        assert (
-            result["explanation"]
-            == "OpenAI provided the most accurate information, Anthropic had good structure, and Gemini had unique insights"
+        assert result["weights"] == [0.5, 0.5, 0.0]
+        assert result["result"] == "Blended"
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_blend_zero_weights_fallback(
+        self, judge, sample_responses, mock_openai_model
+    ):
+        """Test that all-zero weights fall back to the first response."""
+        judge.blend_responses = True
+        mock_openai_model.query.return_value = {
+            "response": '{"weights": [0, 0, 0]}',
+            "success": True,
+        }
+
+        result = await judge.evaluate("Test prompt", sample_responses)
+
+        assert len(mock_openai_model.query.calls) == 1
+        assert result["method"] == "fallback"
+        assert result["result"] == "Response from OpenAI model"
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_blend_streams_tokens(
+        self, judge, sample_responses, mock_openai_model
+    ):
+        """Test that blended text is streamed to on_token and returned in full."""
+        judge.blend_responses = True
+        mock_openai_model.query.return_value = {
+            "response": '{"weights": [5, 3, 2]}',
+            "success": True,
+        }
+
+        async def fake_stream(prompt, model):
+            for chunk in ["Blended ", "response"]:
+                yield chunk
+
+        mock_openai_model.query_stream = fake_stream
+        tokens = []
+
+        result = await judge.evaluate(
+            "Test prompt", sample_responses, on_token=tokens.append
+        )
+
+        # Only the weighting call goes through query
+        assert len(mock_openai_model.query.calls) == 1
+        assert tokens == ["Blended ", "response"]
+        assert result["result"] == "Blended response"
+        assert result["method"] == "blend"
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_blend_dominant_weight_skips_blending(
+        self, judge, sample_responses, mock_openai_model
+    ):
+        """Test that a dominant weight returns that response without a blend call."""
+        judge.blend_responses = True
+        mock_openai_model.query.return_value = {
+            "response": '{"weights": [9, 1, 0], "explanation": "First is best"}',
+            "success": True,
+        }
+
+        result = await judge.evaluate("Test prompt", sample_responses)
+
+        assert len(mock_openai_model.query.calls) == 1
+        assert result["method"] == "blend_shortcircuit"
+        assert result["result"] == "Response from OpenAI model"
+        assert result["weights"] == [0.9, 0.1, 0.0]
+
+    @pytest.mark.judge_evaluate
+    @pytest.mark.parametrize(
+        "judge_outputs,reason",
+        [
+            pytest.param(
+                [
+                    {"response": '{"weights": [5, 3, 2]}', "success": True},
+                    {"error": "Judge API error", "success": False},
+                ],
+                "Blending failed",
+                id="blend_failed",
+            ),
+            pytest.param(
+                [{"response": "I can't decide", "success": True}],
+                "Could not parse valid weights",
+                id="unparseable_weights",
+            ),
+        ],
+    )
+    async def test_evaluate_blend_failure_is_not_cached(
+        self, judge, sample_responses, mock_openai_model, judge_outputs, reason
+    ):
+        """Test that a failed blend falls back and asks the judge again next time."""
+        judge.blend_responses = True
+        mock_openai_model.query.side_effect = judge_outputs * 2
+
+        first = await judge.evaluate("Test prompt", sample_responses)
+        second = await judge.evaluate("Test prompt", sample_responses)
+
+        assert len(mock_openai_model.query.calls) == 2 * len(judge_outputs)
+        for result in (first, second):
+            assert result["method"] == "fallback"
+            assert result["reason"] == reason
+            assert result["result"] == "Response from OpenAI model"
+
+    @pytest.mark.judge_evaluate
+    @pytest.mark.parametrize(
+        "threshold,weights,method",
+        [
+            pytest.param(0.9, "[9, 1, 0]", "blend_shortcircuit", id="at_threshold"),
+            pytest.param(1.0, "[10, 0, 0]", "blend", id="disabled"),
+        ],
+    )
+    async def test_evaluate_blend_dominance_threshold_boundary(
+        self, judge, sample_responses, mock_openai_model, threshold, weights, method
+    ):
+        """Test that a weight equal to the threshold skips blending unless it is 1.0."""
+        judge.blend_responses = True
+        judge.blend_dominance_threshold = threshold
+        mock_openai_model.query.return_value = {
+            "response": '{"weights": %s}' % weights,
+            "success": True,
+        }
+
+        result = await judge.evaluate("Test prompt", sample_responses)
+
+        assert result["method"] == method
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_consensus_skips_judge(
+        self, judge, sample_responses, mock_openai_model
+    ):
+        """Test that responses differing only in case/whitespace skip the judge."""
+        responses = [
+            {**r, "response": "Paris is the capital of France."}
+            for r in sample_responses
+        ]
+        responses[1]["response"] = "  paris is the capital  of france. "
+
+        result = await judge.evaluate("Test prompt", responses)
+
+        assert mock_openai_model.query.calls == []
+        assert result["method"] == "consensus"
+        assert result["reason"] == "All 3 models agreed"
+        assert result["best_response"]["provider"] == "OpenAI"
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_consensus_skips_blending(
+        self, judge, sample_responses, mock_openai_model
+    ):
+        """Test that byte-identical responses skip both the judge and the blend."""
+        judge.blend_responses = True
+        responses = [{**r, "response": "42"} for r in sample_responses]
+
+        result = await judge.evaluate("Test prompt", responses)
+
+        assert mock_openai_model.query.calls == []
+        assert result["method"] == "consensus"
+        assert result["result"] == "42"
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_blend_deduplicates_responses(
+        self, judge, sample_responses, mock_openai_model
+    ):
+        """Test that duplicates are judged once and share their weight."""
+        judge.blend_responses = True
+        responses = [dict(r) for r in sample_responses]
+        responses[2]["response"] = responses[0]["response"]
+        mock_openai_model.query.side_effect = [
+            {"response": '{"weights": [6, 4]}', "success": True},
+            {"response": "Blended", "success": True},
+        ]
+
+        result = await judge.evaluate("Test prompt", responses)
+
+        # Only two distinct responses are shown to the judge
+        eval_prompt = mock_openai_model.query.calls[0][0][0]
+        assert "--- Response 3" not in eval_prompt
+
+        providers = [r["provider"] for r in result["responses"]]
+        assert providers == ["OpenAI", "Google Gemini", "Anthropic"]
+        assert result["weights"] == pytest.approx([0.3, 0.3, 0.4])
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_batch_shares_judge_call(
+        self, judge, sample_responses, mock_openai_model
+    ):
+        """Test that several prompts are judged with a single judge call."""
+        mock_openai_model.query.return_value = {
+            "response": '{"verdicts": [{"selection": 1, "explanation": "A"}, {"selection": 3, "explanation": "B"}]}',
+            "success": True,
+        }
+
+        results = await judge.evaluate_batch(
+            [
+                ("First prompt", sample_responses),
+                ("Second prompt", sample_responses),
+            ]
+        )
+
+        assert len(mock_openai_model.query.calls) == 1
+        batch_prompt = mock_openai_model.query.calls[-1][0][0]
+        assert "=== Problem 1 ===" in batch_prompt
+        assert "=== Problem 2 ===" in batch_prompt
+        assert results[0]["best_response"]["provider"] == "OpenAI"
+        assert results[0]["explanation"] == "A"
+        assert results[1]["best_response"]["provider"] == "Google Gemini"
+        assert results[1]["explanation"] == "B"
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_batch_falls_back_to_evaluate(
+        self, judge, sample_responses, mock_openai_model
+    ):
+        """Test that problems without a usable batched verdict are judged individually."""
+        mock_openai_model.query.side_effect = [
+            {"response": '{"verdicts": [{"selection": 2}]}', "success": True},
+            {"response": '{"selection": 1}', "success": True},
+        ]
+
+        results = await judge.evaluate_batch(
+            [
+                ("First prompt", sample_responses),
+                ("Second prompt", sample_responses),
+            ]
         )
+
+        assert len(mock_openai_model.query.calls) == 2
+        assert results[0]["best_response"]["provider"] == "Anthropic"
+        assert results[1]["best_response"]["provider"] == "OpenAI"
+
+    @pytest.mark.judge_evaluate
+    async def test_evaluate_compact_output(
+        self, judge, sample_responses, mock_openai_model
+    ):
+        """Test that compact output returns an id for the stored judge response."""
+        judge.compact_output = True
+        judge_text = '{"selection": 1, "explanation": "Response 1 is best"}'
+        mock_openai_model.query.return_value = {
+            "response": judge_text,
+            "success": True,
+        }
+
+        result = await judge.evaluate("Test prompt", sample_responses)
+
+        assert "judge_response" not in result
+        assert judge.get_judge_response(result["judge_response_id"]) == judge_text
+
+    async def test_judge_calls_respect_concurrency_limit(
+        self, sample_responses, mock_openai_model
+    ):
+        """Test that concurrent judge calls never exceed the shared limit."""
+        active = 0
+        peak = 0
+
+        async def slow_query(prompt, model):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"response": '{"selection": 1}', "success": True}
+
+        mock_openai_model.query.side_effect = slow_query
+        judge = Judge(model_provider="openai", num_judge_samples=5)
+
+        with patch(
+            "multi_ai.services.judge._judge_limits",
+            return_value=(asyncio.Semaphore(2), TokenBucket(0)),
+        ):
+            await judge.evaluate("Test prompt", sample_responses)
+
+        assert len(mock_openai_model.query.calls) == 5
+        assert peak == 2
+
+
+class TestJudgeBatcher:
+    async def test_calls_start_concurrently(self):
+        """Test that queued calls start together while their bins have free slots."""
+        batcher = JudgeBatcher([100])
+        started = []
+        release = asyncio.Event()
+
+        async def call(name):
+            started.append(name)
+            await release.wait()
+            return name
+
+        short_a = asyncio.create_task(batcher.submit(10, lambda: call("a")))
+        short_b = asyncio.create_task(batcher.submit(20, lambda: call("b")))
+        long_c = asyncio.create_task(batcher.submit(500, lambda: call("c")))
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        # Each bin's worker started its queued calls without waiting for others
+        assert sorted(started) == ["a", "b", "c"]
+
+        release.set()
+        assert await asyncio.gather(short_a, short_b, long_c) == ["a", "b", "c"]
+        await batcher.close()
+
+    async def test_slow_call_does_not_block_the_next(self):
+        """Test that a call queued behind a running one starts without waiting for it."""
+        batcher = JudgeBatcher([100])
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "slow"
+
+        async def fast():
+            return "fast"
+
+        slow_call = asyncio.create_task(batcher.submit(10, slow))
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        # Same bin, queued while the first call is still running
+        assert await asyncio.wait_for(batcher.submit(10, fast), 1) == "fast"
+        assert not slow_call.done()
+
+        release.set()
+        assert await slow_call == "slow"
+        await batcher.close()
+
+    async def test_bin_concurrency_is_bounded(self):
+        """Test that each bin runs at most max_inflight calls, independently."""
+        batcher = JudgeBatcher([100], max_inflight=1)
+        started = []
+        release = asyncio.Event()
+
+        async def call(name):
+            started.append(name)
+            await release.wait()
+            return name
+
+        long_a = asyncio.create_task(batcher.submit(500, lambda: call("a")))
+        long_b = asyncio.create_task(batcher.submit(600, lambda: call("b")))
+        short_c = asyncio.create_task(batcher.submit(10, lambda: call("c")))
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        # The long bin's single slot is taken; the short bin has its own
+        assert sorted(started) == ["a", "c"]
+
+        release.set()
+        assert await asyncio.gather(long_a, long_b, short_c) == ["a", "b", "c"]
+        await batcher.close()
+
+    async def test_cancelled_caller_cancels_its_call(self):
+        """Test that cancelling a submitter stops the call it started."""
+        batcher = JudgeBatcher([100])
+        cancelled = asyncio.Event()
+
+        async def call():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        submitter = asyncio.create_task(batcher.submit(10, call))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        submitter.cancel()
+
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await batcher.close()
+
+    async def test_exceptions_reach_the_caller(self):
+        """Test that a failing call raises in its submitter and the bin keeps working."""
+        batcher = JudgeBatcher([100])
+
+        async def fail():
+            raise RuntimeError("judge down")
+
+        async def succeed():
+            return "ok"
+
+        with pytest.raises(RuntimeError, match="judge down"):
+            await batcher.submit(10, fail)
+        assert await batcher.submit(10, succeed) == "ok"
+        await batcher.close()
+
+    async def test_judge_uses_configured_batcher(
+        self, sample_responses, mock_openai_model, monkeypatch
+    ):
+        """Test that JUDGE_BIN_BOUNDARIES routes judge calls through a batcher."""
+        monkeypatch.setenv("JUDGE_BIN_BOUNDARIES", "1000,4000")
+        _judge_batcher.cache_clear()
+        mock_openai_model.query.return_value = {
+            "response": '{"selection": 1}',
+            "success": True,
+        }
+
+        try:
+            batcher = _judge_batcher()
+            with patch.object(batcher, "submit", wraps=batcher.submit) as submit:
+                judge = Judge(model_provider="openai")
+                result = await judge.evaluate("Test prompt", sample_responses)
+        finally:
+            await close_judge_batcher()
+            _judge_batcher.cache_clear()
+
+        assert batcher.boundaries == [1000, 4000]
+        submit.assert_called_once()
+        assert result["method"] == "select"
@@ -1,180 +1,257 @@
+import orjson
 import pytest
-from unittest.mock import patch, AsyncMock, MagicMock
-from fastapi.testclient import TestClient
-from multi_ai.api import app, comparator, blending_comparator
+from fastapi import HTTPException
+from unittest.mock import patch, AsyncMock
+from multi_ai.api import comparator, blending_comparator
 
 
-@pytest.fixture
-def client():
-    return TestClient(app)
+SELECT_EXPLANATION = "OpenAI provided the most detailed and accurate response"
+BLEND_EXPLANATION = (
+    "OpenAI was strongest on accuracy while Anthropic had better organization"
+)
 
+# Default comparator results; format_response only reads them, so they're shared
+SELECT_RESULT = {
+    "result": "Selected model response",
+    "best_response": {"provider": "OpenAI", "model": "gpt-4"},
+    "method": "select",
+    "explanation": SELECT_EXPLANATION,
+    "success": True,
+}
 
-@pytest.fixture
-def mock_comparators():
-    with patch.object(
-        comparator, "compare", new_callable=AsyncMock
-    ) as mock_compare, patch.object(
-        blending_comparator, "compare", new_callable=AsyncMock
-    ) as mock_blend_compare:
+BLEND_RESULT = {
+    "result": "Blended response",
+    "weights": [0.7, 0.3],
+    "responses": [{"provider": "OpenAI"}, {"provider": "Anthropic"}],
+    "method": "blend",
+    "explanation": BLEND_EXPLANATION,
+    "success": True,
+}
 
-        # Setup default return values
-        mock_compare.return_value = {
-            "result": "Selected model response",
-            "best_response": {"provider": "OpenAI", "model": "gpt-4"},
-            "method": "select",
-            "explanation": "OpenAI provided the most detailed and accurate response",
-            "success": True,
-        }
+COMPARATOR_DEFAULTS = {"standard": SELECT_RESULT, "blending": BLEND_RESULT}
 
-        mock_blend_compare.return_value = {
-            "result": "Blended response",
-            "weights": [0.7, 0.3],
-            "responses": [{"provider": "OpenAI"}, {"provider": "Anthropic"}],
-            "method": "blend",
-            "explanation": "OpenAI was strongest on accuracy while Anthropic had better organization",
-            "success": True,
-        }
 
-        yield {"standard": mock_compare, "blending": mock_blend_compare}
+STANDARD_MODELS = {"openai": "gpt-4-turbo", "anthropic": "claude-3-opus-latest"}
+BLEND_MODELS = {
+    "openai": "gpt-4-turbo",
+    "anthropic": "claude-3-opus-latest",
+    "gemini": "gemini-2.5-pro-preview-05-06",
+}
 
 
-class TestAPIEndpoints:
+def _detailed(result):
+    """The /compare body for a comparator result when details are requested."""
+    return {
+        "result": result["result"],
+        "success": result["success"],
+        "explanation": result["explanation"],
+        "details": {k: v for k, v in result.items() if k not in ("result", "success")},
+    }
+
+
+COMPARE_SCENARIOS = [
+    pytest.param(
+        {
+            "request": {
+                "prompt": "Test prompt",
+                "models": STANDARD_MODELS,
+                "blend": False,
+                "include_details": True,
+            },
+            "comparator": "standard",
+            "error": None,
+            "status": 200,
+            "expected": _detailed(SELECT_RESULT),
+        },
+        id="standard",
+    ),
+    pytest.param(
+        {
+            "request": {
+                "prompt": "Test prompt",
+                "models": BLEND_MODELS,
+                "blend": True,
+                "include_details": True,
+            },
+            "comparator": "blending",
+            "error": None,
+            "status": 200,
+            "expected": _detailed(BLEND_RESULT),
+        },
+        id="blending",
+    ),
+    pytest.param(
+        {
+            "request": {
+                "prompt": "Test prompt",
+                "blend": False,
+                "include_details": False,
+            },
+            "comparator": "standard",
+            "error": None,
+            "status": 200,
+            # Details and explanation are only included on request
+            "expected": {
+                "result": "Selected model response",
+                "success": True,
+                "explanation": None,
+                "details": None,
+            },
+        },
+        id="without_details",
+    ),
+    pytest.param(
+        {
+            "request": {"prompt": "Test prompt", "blend": False},
+            "comparator": "standard",
+            "error": Exception("Test error"),
+            "status": 500,
+            "expected": {"detail": "Test error"},
+        },
+        id="error",
+    ),
+    pytest.param(
+        {
+            "request": {"prompt": "Test prompt", "blend": False},
+            "comparator": "standard",
+            # HTTP errors pass through with their own status and detail
+            "error": HTTPException(status_code=503, detail="Test error"),
+            "status": 503,
+            "expected": {"detail": "Test error"},
+        },
+        id="http_error",
+    ),
+]
+
+
+def _json(response):
+    """Decode a JSON response body straight from bytes."""
+    return orjson.loads(response.content)
+
+
+# The patched compare methods, filled in by comparator_patches
+COMPARATOR_MOCKS = {}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def comparator_patches():
+    """Patch both comparators' compare methods once for the module."""
+    patchers = {
+        "standard": patch.object(comparator, "compare", new_callable=AsyncMock),
+        "blending": patch.object(
+            blending_comparator, "compare", new_callable=AsyncMock
+        ),
+    }
+    COMPARATOR_MOCKS.update(
+        {name: patcher.start() for name, patcher in patchers.items()}
+    )
+    yield
+    for patcher in patchers.values():
+        patcher.stop()
+    COMPARATOR_MOCKS.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_comparators():
+    """Reset the patched compare methods to their default results."""
+    for name, mock in COMPARATOR_MOCKS.items():
+        mock.reset_mock()
+        mock.return_value = COMPARATOR_DEFAULTS[name]
+        mock.side_effect = None
+
 
-    def test_home_page(self, client):
+@pytest.fixture(scope="module")
+async def home_response(app_client):
+    """The rendered home page, fetched once for the module."""
+    return await app_client.get("/")
+
+
+class TestAPIEndpoints:
+    def test_home_page(self, home_response):
         """Test that the home page endpoint returns HTML."""
-        response = client.get("/")
-        assert response.status_code == 200
-        assert "text/html" in response.headers["content-type"]
-        assert "Multi-AI Comparison" in response.text
+        assert home_response.status_code == 200
+        assert "text/html" in home_response.headers["content-type"]
+        assert b"Multi-AI Comparison" in home_response.content
 
-    def test_list_models(self, client):
+    async def test_list_models(self, client):
         """Test that the models endpoint returns the available models."""
-        response = client.get("/models")
+        response = await client.get("/models")
         assert response.status_code == 200
 
-        data = response.json()
+        data = _json(response)
         assert "models" in data
         assert "openai" in data["models"]
         assert "anthropic" in data["models"]
         assert "gemini" in data["models"]
 
-    def test_compare_models_standard(self, client, mock_comparators):
-        """Test the compare endpoint with standard (non-blending) mode."""
-        request_data = {
-            "prompt": "Test prompt",
-            "models": {"openai": "gpt-4-turbo", "anthropic": "claude-3-opus-latest"},
-            "blend": False,
-            "include_details": True,
-        }
+    @pytest.mark.parametrize("scenario", COMPARE_SCENARIOS)
+    async def test_compare_models(self, client, scenario):
+        """Test the compare endpoint across modes, detail levels and failures."""
+        selected = COMPARATOR_MOCKS[scenario["comparator"]]
+        selected.side_effect = scenario["error"]
 
-        response = client.post("/compare", json=request_data)
+        response = await client.post("/compare", json=scenario["request"])
 
-        # Check response
-        assert response.status_code == 200
-        data = response.json()
-        assert data["result"] == "Selected model response"
-        assert data["success"] is True
-        assert "details" in data
-        assert data["details"]["method"] == "select"
-
-        # Check explanation field is included at top level and in details
-        assert "explanation" in data
-        assert (
-            data["explanation"]
-            == "OpenAI provided the most detailed and accurate response"
-        )
-        assert "explanation" in data["details"]
-        assert (
-            data["details"]["explanation"]
-            == "OpenAI provided the most detailed and accurate response"
-        )
+        assert response.status_code == scenario["status"]
+        assert _json(response) == scenario["expected"]
 
-        # Check comparator was called correctly
-        mock_comparators["standard"].assert_called_once_with(
-            "Test prompt",
-            {"openai": "gpt-4-turbo", "anthropic": "claude-3-opus-latest"},
+        # Only the comparator matching the blend flag is called
+        assert selected.call_count == 1
+        assert selected.call_args.args == (
+            scenario["request"]["prompt"],
+            scenario["request"].get("models"),
         )
-        mock_comparators["blending"].assert_not_called()
-
-    def test_compare_models_blending(self, client, mock_comparators):
-        """Test the compare endpoint with blending mode."""
-        request_data = {
-            "prompt": "Test prompt",
-            "models": {
-                "openai": "gpt-4-turbo",
-                "anthropic": "claude-3-opus-latest",
-                "gemini": "gemini-2.5-pro-preview-05-06",
-            },
-            "blend": True,
-            "include_details": True,
-        }
+        for mock in COMPARATOR_MOCKS.values():
+            if mock is not selected:
+                mock.assert_not_called()
 
-        response = client.post("/compare", json=request_data)
+    async def test_compare_stream(self, client):
+        """Test that the streaming endpoint emits progress events and a final result."""
 
-        # Check response
-        assert response.status_code == 200
-        data = response.json()
-        assert data["result"] == "Blended response"
-        assert data["success"] is True
-        assert "details" in data
-        assert data["details"]["method"] == "blend"
-        assert "weights" in data["details"]
-
-        # Check explanation field is included at top level and in details
-        assert "explanation" in data
-        assert (
-            data["explanation"]
-            == "OpenAI was strongest on accuracy while Anthropic had better organization"
-        )
-        assert "explanation" in data["details"]
-        assert (
-            data["details"]["explanation"]
-            == "OpenAI was strongest on accuracy while Anthropic had better organization"
-        )
+        async def fake_compare_iter(prompt, models):
+            yield {
+                "event": "provider_done",
+                "provider": "openai",
+                "model": "gpt-4",
+                "success": True,
+            }
+            yield {"event": "judging"}
+            yield {
+                "event": "result",
+                "data": {
+                    "result": "Selected model response",
+                    "method": "select",
+                    "success": True,
+                },
+            }
 
-        # Check blending comparator was called correctly
-        mock_comparators["standard"].assert_not_called()
-        mock_comparators["blending"].assert_called_once_with(
-            "Test prompt",
-            {
-                "openai": "gpt-4-turbo",
-                "anthropic": "claude-3-opus-latest",
-                "gemini": "gemini-2.5-pro-preview-05-06",
-            },
-        )
+        with patch.object(comparator, "compare_iter", side_effect=fake_compare_iter):
+            response = await client.post(
+                "/compare/stream", json={"prompt": "Test prompt", "blend": False}
+            )
+
+        assert response.status_code == 200
+        assert "application/x-ndjson" in response.headers["content-type"]
 
-    def test_compare_models_without_details(self, client, mock_comparators):
-        """Test the compare endpoint without including details."""
-        request_data = {
-            "prompt": "Test prompt",
-            "blend": False,
-            "include_details": False,
+        events = [orjson.loads(line) for line in response.content.splitlines()]
+        assert [e["event"] for e in events] == ["provider_done", "judging", "result"]
+        assert events[-1]["data"] == {
+            "result": "Selected model response",
+            "success": True,
         }
 
-        response = client.post("/compare", json=request_data)
+    async def test_compare_stream_error(self, client):
+        """Test that errors during streaming are reported as an error event."""
+
+        async def failing_compare_iter(prompt, models):
+            raise Exception("Test error")
+            yield  # pragma: no cover
+
+        with patch.object(comparator, "compare_iter", side_effect=failing_compare_iter):
+            response = await client.post(
+                "/compare/stream", json={"prompt": "Test prompt", "blend": False}
+            )
 
-        # Check response
         assert response.status_code == 200
-        data = response.json()
-        assert data["result"] == "Selected model response"
-        assert data["success"] is True
-        assert (
-            data.get("details") is None
-        )  # Check details is None instead of not present
-        assert (
-            data.get("explanation") is None
-        )  # Explanation should not be included without details
-
-    def test_compare_models_error(self, client, mock_comparators):
-        """Test error handling in the compare endpoint."""
-        mock_comparators["standard"].side_effect = Exception("Test error")
-
-        request_data = {"prompt": "Test prompt", "blend": False}
-
-        response = client.post("/compare", json=request_data)
-
-        # Check error response
-        assert response.status_code == 500
-        data = response.json()
-        assert "detail" in data
-        assert data["detail"] == "Test error"
+        events = [orjson.loads(line) for line in response.content.splitlines()]
+        assert events == [{"event": "error", "detail": "Test error"}]
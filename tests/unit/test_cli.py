@@ -0,0 +1,88 @@
+import pytest
+from multi_ai.cli import (
+    build_parser,
+    parse_args,
+    get_prompt,
+    read_text_file,
+    _fast_parse_args,
+)
+
+
+class TestParseArgs:
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["models"],
+            ["setup"],
+            ["setup", "--force"],
+            ["compare", "Test prompt"],
+            ["compare"],
+            ["compare", "-f", "prompt.txt", "-o", "out.json", "-b", "-d"],
+            [
+                "compare",
+                "--openai",
+                "gpt-4",
+                "Test prompt",
+                "--anthropic",
+                "claude-3-opus-latest",
+                "--gemini",
+                "gemini-pro",
+                "--details",
+            ],
+        ],
+    )
+    def test_fast_path_matches_argparse(self, argv):
+        """Test that the fast path produces the same values as argparse."""
+        fast = _fast_parse_args(argv)
+
+        assert fast is not None
+        assert vars(fast) == vars(build_parser().parse_args(argv))
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            [],
+            ["--help"],
+            ["models", "extra"],
+            ["compare", "--help"],
+            ["compare", "--openai"],
+            ["compare", "--openai=gpt-4", "Test prompt"],
+            ["compare", "first", "second"],
+            ["setup", "--unknown"],
+        ],
+    )
+    def test_fast_path_defers_unusual_arguments(self, argv):
+        """Test that anything unusual is left to argparse."""
+        assert _fast_parse_args(argv) is None
+
+    def test_parse_args_falls_back_to_argparse(self):
+        """Test that parse_args handles arguments the fast path rejects."""
+        args = parse_args(["compare", "--openai=gpt-4", "Test prompt"])
+
+        assert args.openai == "gpt-4"
+        assert args.prompt == "Test prompt"
+
+
+class TestGetPrompt:
+    def test_read_text_file(self, tmp_path):
+        """Test reading a UTF-8 prompt file."""
+        prompt_file = tmp_path / "prompt.txt"
+        prompt_file.write_bytes("Explain café culture\n".encode("utf-8"))
+
+        assert read_text_file(str(prompt_file)) == "Explain café culture\n"
+
+    def test_get_prompt_from_file(self, tmp_path):
+        """Test that get_prompt prefers the --file argument."""
+        prompt_file = tmp_path / "prompt.txt"
+        prompt_file.write_text("Prompt from file")
+
+        args = parse_args(["compare", "--file", str(prompt_file), "ignored"])
+
+        assert get_prompt(args) == "Prompt from file"
+
+    def test_read_empty_file(self, tmp_path):
+        """Test that an empty file yields an empty prompt."""
+        prompt_file = tmp_path / "empty.txt"
+        prompt_file.write_text("")
+
+        assert read_text_file(str(prompt_file)) == ""
@@ -0,0 +1,51 @@
+from unittest.mock import patch
+from multi_ai.utils.cache import TTLCache, make_cache_key
+
+
+class TestMakeCacheKey:
+    def test_key_is_stable(self):
+        """Test that identical requests produce the same key regardless of dict order."""
+        key1 = make_cache_key("prompt", {"openai": "a", "gemini": "b"}, False)
+        key2 = make_cache_key("prompt", {"gemini": "b", "openai": "a"}, False)
+        assert key1 == key2
+
+    def test_key_depends_on_inputs(self):
+        """Test that prompt, models and blend mode all affect the key."""
+        base = make_cache_key("prompt", {"openai": "a"}, False)
+        assert base != make_cache_key("other prompt", {"openai": "a"}, False)
+        assert base != make_cache_key("prompt", {"openai": "b"}, False)
+        assert base != make_cache_key("prompt", {"openai": "a"}, True)
+
+
+class TestTTLCache:
+    def test_get_missing(self):
+        """Test that a missing key returns None."""
+        cache = TTLCache()
+        assert cache.get("missing") is None
+
+    def test_set_and_get(self):
+        """Test storing and retrieving a value."""
+        cache = TTLCache()
+        cache.set("key", {"result": "value"})
+        assert cache.get("key") == {"result": "value"}
+
+    def test_expired_entry(self):
+        """Test that entries are dropped once their TTL has passed."""
+        cache = TTLCache(ttl=10)
+        with patch("multi_ai.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value")
+        with patch("multi_ai.utils.cache.time.monotonic", return_value=111.0):
+            assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
@@ -0,0 +1,58 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from multi_ai.utils.rate_limit import TokenBucket
+
+
+class TestTokenBucket:
+    async def test_disabled_bucket_never_waits(self):
+        """Test that a non-positive rate disables limiting."""
+        bucket = TokenBucket(0)
+        with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            for _ in range(100):
+                await bucket.acquire()
+            mock_sleep.assert_not_called()
+
+    async def test_burst_within_capacity(self):
+        """Test that requests within the burst capacity don't wait."""
+        bucket = TokenBucket(600)  # 10 per second
+        with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            for _ in range(10):
+                await bucket.acquire()
+            mock_sleep.assert_not_called()
+
+    async def test_waits_when_empty(self):
+        """Test that acquiring from an empty bucket sleeps until a token refills."""
+        bucket = TokenBucket(60)  # 1 per second
+        clock = [100.0]
+
+        async def fake_sleep(seconds):
+            clock[0] += seconds
+
+        with patch(
+            "multi_ai.utils.rate_limit.time.monotonic", side_effect=lambda: clock[0]
+        ), patch("asyncio.sleep", side_effect=fake_sleep) as mock_sleep:
+            bucket._updated = clock[0]
+            await bucket.acquire()
+            await bucket.acquire()
+
+            mock_sleep.assert_called_once()
+            assert mock_sleep.call_args[0][0] == pytest.approx(1.0)
+
+    async def test_cost_larger_than_capacity_leaves_debt(self):
+        """Test that a large cost is admitted from a full bucket and delays the next caller."""
+        bucket = TokenBucket(600)  # 10 per second, capacity 10
+        clock = [100.0]
+
+        async def fake_sleep(seconds):
+            clock[0] += seconds
+
+        with patch(
+            "multi_ai.utils.rate_limit.time.monotonic", side_effect=lambda: clock[0]
+        ), patch("asyncio.sleep", side_effect=fake_sleep) as mock_sleep:
+            bucket._updated = clock[0]
+            await bucket.acquire(30)
+            mock_sleep.assert_not_called()
+
+            # 20 tokens of debt plus 1 for this request at 10 per second
+            await bucket.acquire()
+            assert clock[0] - 100.0 == pytest.approx(2.1)